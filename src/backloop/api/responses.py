@@ -1,4 +1,5 @@
-from typing import Generic, TypeVar, Union, Any
+from typing import Generic, TypeVar, Any
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 
 from backloop.models import Comment
@@ -50,3 +51,16 @@ class FileContentResponse(BaseModel):
     status: str = "success"
     content: str
     filename: str
+
+
+class ModelJSONResponse(JSONResponse):
+    """JSON response serialized directly by pydantic's Rust serializer.
+
+    Returning this from a handler skips FastAPI's jsonable_encoder pass and
+    the stdlib JSON encoder, which dominate the cost of large diff payloads.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.model_dump_json(by_alias=True).encode("utf-8")
+        return super().render(content)
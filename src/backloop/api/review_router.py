@@ -1,39 +1,223 @@
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
-from datetime import datetime
 from pathlib import Path as PathLib
+import codecs
+import hashlib
+import importlib.metadata
+import os
+import re
+import stat
 import subprocess
 
-from fastapi import APIRouter, Path, HTTPException, Query, WebSocket, WebSocketDisconnect, Request
-from fastapi.responses import FileResponse, RedirectResponse, PlainTextResponse
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, Path, HTTPException, Query, WebSocket, WebSocketDisconnect, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import FileResponse, RedirectResponse, Response
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
-from backloop.models import Comment, CommentRequest, DiffFile, FileEditRequest, GitDiff, CommentStatus, ReviewInfo
-from backloop.api.responses import SuccessResponse
-from backloop.event_manager import EventType
+from backloop.models import Comment, CommentRequest, DiffFile, FileEditRequest, GitDiff, ReviewInfo
+from backloop.api.responses import ModelJSONResponse, SuccessResponse
+from backloop.event_manager import EventType, encode_event_batch
 from backloop.config import settings
+from backloop.review_session import ReviewSession
+from backloop.git_service import is_immutable_ref
+from backloop.mock_data import get_mock_diff
+from backloop.utils.patch import MalformedPatchError, PatchError, apply_unified_diff
 from backloop.version import get_version_info
 
 
+# `git apply` messages for patches that could not be parsed at all, as
+# opposed to patches that parse but do not match the file.
+GIT_APPLY_MALFORMED_RE = re.compile(r"corrupt patch|No valid patches in input|patch fragment without header")
+
+
+REVIEW_NOT_FOUND = "Review not found"
+
+STATIC_DIR = PathLib(__file__).parent.parent / "static"
+REVIEW_PAGE_PATH = STATIC_DIR / "templates" / "review.html"
+FAVICON_ICO_PATH = STATIC_DIR / "favicon.ico"
+FAVICON_SVG_PATH = STATIC_DIR / "favicon.svg"
+
+# Edits read, patch and rewrite files, so they run on a dedicated worker
+# thread: this keeps them off the shared threadpool and serializes them so
+# concurrent saves to the same file cannot interleave.
+EDIT_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="backloop-edit")
+
+# Number of applied edits remembered for detecting resubmitted patches.
+RECENT_EDITS_SIZE = 256
+
+# The edit endpoint parses its body by hand, so document it explicitly.
+FILE_EDIT_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": FileEditRequest.model_json_schema()}},
+    }
+}
+
+COMMENT_LIST_ADAPTER = TypeAdapter(List[Comment])
+
+# Bytes inspected to decide whether a working tree file is UTF-8 text.
+UTF8_PROBE_SIZE = 4096
+
+
+def _package_version() -> str:
+    """Return the installed backloop version, or "" when running from source."""
+    try:
+        return importlib.metadata.version("backloop")
+    except importlib.metadata.PackageNotFoundError:
+        return ""
+
+
+# Identify the code serving key-based ETags: the release, and the commit for
+# source checkouts whose version does not change between edits.
+ETAG_VERSION_PARTS = (_package_version(), get_version_info()["commit"] or "")
+
+
+def not_modified_response(request: Request, etag: str) -> Response | None:
+    """Return a 304 response if the client already has the ETag, else None."""
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+    return None
+
+
+def key_etag(*parts: str) -> str:
+    """Build an ETag for content fully determined by the given key parts.
+
+    The backloop version is part of the key, so content cached by a browser
+    is not revalidated against an upgrade that changed how it is rendered.
+    """
+    key = "\0".join((*ETAG_VERSION_PARTS, *parts)).encode("utf-8")
+    return f'"{hashlib.blake2b(key, digest_size=8).hexdigest()}"'
+
+
+def etag_response(request: Request, content: bytes, etag: str, media_type: str) -> Response:
+    """Build a response carrying an ETag, answering 304 if the client has it."""
+    not_modified = not_modified_response(request, etag)
+    if not_modified is not None:
+        return not_modified
+    return tagged_response(content, etag, media_type)
+
+
+def tagged_response(content: bytes, etag: str, media_type: str) -> Response:
+    """Build a 200 response carrying an ETag the client has been checked against."""
+    return Response(
+        content=content, media_type=media_type, headers={"ETag": etag, "Cache-Control": "no-cache"}
+    )
+
+
+class CachedFile:
+    """An in-memory copy of a static file served with an ETag.
+
+    The file is re-read only when its modification time changes, so a
+    request costs a single stat() and unchanged pages revalidate with 304.
+    """
+
+    def __init__(self, path: PathLib, media_type: str) -> None:
+        self.path = path
+        self.media_type = media_type
+        self._mtime_ns: int | None = None
+        self._content = b""
+        self._etag = ""
+
+    def _refresh(self) -> None:
+        mtime_ns = os.stat(self.path).st_mtime_ns
+        if mtime_ns != self._mtime_ns:
+            self._content = self.path.read_bytes()
+            self._etag = f'"{hashlib.blake2b(self._content, digest_size=8).hexdigest()}"'
+            self._mtime_ns = mtime_ns
+
+    def response(self, request: Request) -> Response:
+        """Build a response for the file, honouring If-None-Match."""
+        self._refresh()
+        return etag_response(request, self._content, self._etag, self.media_type)
+
+
 class ApprovalRequest(BaseModel):
     timestamp: str
 
 
+# Async so FastAPI resolves it inline rather than in its threadpool.
+async def _require_review_session(request: Request, review_id: str = Path(...)) -> ReviewSession:
+    """Dependency that looks up the review session, raising 404 if it does not exist."""
+    review_session = request.app.state.review_service.get_review_session(review_id)
+    if review_session is None:
+        raise HTTPException(status_code=404, detail=REVIEW_NOT_FOUND)
+    return review_session
+
+
+def _resolve_repo_path(repo_root: PathLib, raw_path: str) -> PathLib:
+    """Resolve a user-supplied path within the (already resolved) repository root."""
+    root = str(repo_root)
+    # join() keeps raw_path as-is when it is absolute.
+    candidate = os.path.realpath(os.path.join(root, raw_path))
+    if candidate != root and not candidate.startswith(root.rstrip(os.sep) + os.sep):
+        raise HTTPException(status_code=400, detail="Path is outside repository root")
+    return PathLib(candidate)
+
+
+def _stat_repo_path(path: PathLib) -> os.stat_result:
+    """Stat a resolved repository path, raising 404 if it does not exist."""
+    try:
+        return os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        raise HTTPException(status_code=404, detail="File not found")
+
+
+def _looks_like_utf8(path: PathLib) -> bool:
+    """Check that the start of a file decodes as UTF-8."""
+    with open(path, "rb") as f:
+        return _starts_as_utf8(f.read(UTF8_PROBE_SIZE))
+
+
+def _starts_as_utf8(data: bytes) -> bool:
+    """Check that the first UTF8_PROBE_SIZE bytes of data decode as UTF-8."""
+    head = data[:UTF8_PROBE_SIZE]
+    try:
+        # An incremental decoder tolerates a character split at the cut-off.
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=len(head) < UTF8_PROBE_SIZE)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def _apply_patch_with_git(repo_root: PathLib, relative_path: str, patch: str) -> None:
+    """Apply a patch to a single file using `git apply`."""
+    patch_lines = patch.splitlines()
+    patch_lines[0] = f"--- a/{relative_path}"
+    patch_lines[1] = f"+++ b/{relative_path}"
+    sanitized_patch = "\n".join(patch_lines)
+    if patch.endswith("\n"):
+        sanitized_patch += "\n"
+
+    try:
+        # git apply reports problems on stderr only, so stdout is discarded and
+        # stderr is decoded just for the error message.
+        subprocess.run(
+            ["git", "apply", "--whitespace=nowarn", "-"],
+            input=sanitized_patch.encode("utf-8"),
+            cwd=str(repo_root),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            check=True,
+        )
+    except subprocess.CalledProcessError as exc:
+        detail = exc.stderr.decode("utf-8", "replace").strip() or "Unknown git apply error"
+        if GIT_APPLY_MALFORMED_RE.search(detail):
+            raise HTTPException(status_code=400, detail=f"Invalid patch format: {detail}") from exc
+        raise HTTPException(status_code=409, detail=f"Failed to apply patch: {detail}") from exc
+
+
 def create_review_router() -> APIRouter:
     """Create a router for all review-related API endpoints."""
     router = APIRouter()
-    STATIC_DIR = PathLib(__file__).parent.parent / "static"
-
-    def _resolve_repo_path(repo_root: PathLib, raw_path: str) -> PathLib:
-        """Resolve a user-supplied path within the repository root."""
-        candidate = PathLib(raw_path)
-        if not candidate.is_absolute():
-            candidate = repo_root / candidate
-        candidate = candidate.resolve()
-        try:
-            candidate.relative_to(repo_root)
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Path is outside repository root")
-        return candidate
+    review_page = CachedFile(REVIEW_PAGE_PATH, "text/html")
+    favicon_ico = CachedFile(FAVICON_ICO_PATH, "image/x-icon")
+    favicon_svg = CachedFile(FAVICON_SVG_PATH, "image/svg+xml")
+    # (path, patch digest) -> (mtime_ns, size, response) after a successful edit.
+    # Only touched from EDIT_EXECUTOR's single thread.
+    recent_edits: OrderedDict[tuple[str, bytes], tuple[int, int, SuccessResponse[dict]]] = OrderedDict()
 
     @router.get("/health")
     async def health_check() -> dict:
@@ -46,18 +230,18 @@ def create_review_router() -> APIRouter:
         return get_version_info()
 
     @router.get("/favicon.ico")
-    async def get_favicon() -> FileResponse:
-        favicon_path = STATIC_DIR / "favicon.ico"
-        if not favicon_path.exists():
+    async def get_favicon(request: Request) -> Response:
+        try:
+            return favicon_ico.response(request)
+        except FileNotFoundError:
             raise HTTPException(status_code=404, detail="Favicon not found")
-        return FileResponse(favicon_path, media_type="image/x-icon")
 
     @router.get("/static/favicon.svg")
-    async def get_favicon_svg() -> FileResponse:
-        favicon_path = STATIC_DIR / "favicon.svg"
-        if not favicon_path.exists():
+    async def get_favicon_svg(request: Request) -> Response:
+        try:
+            return favicon_svg.response(request)
+        except FileNotFoundError:
             raise HTTPException(status_code=404, detail="Favicon not found")
-        return FileResponse(favicon_path, media_type="image/svg+xml")
 
     @router.get("/")
     async def redirect_to_latest_review(request: Request) -> RedirectResponse:
@@ -68,28 +252,17 @@ def create_review_router() -> APIRouter:
         return RedirectResponse(url=f"/review/{recent_review.id}")
 
     @router.get("/review/{review_id}")
-    async def redirect_to_review_view(request: Request, review_id: str = Path(...)) -> RedirectResponse:
-        review_service = request.app.state.review_service
-        review_session = review_service.get_review_session(review_id)
-        if not review_session:
-            raise HTTPException(status_code=404, detail="Review not found")
-        return RedirectResponse(url=f"/review/{review_id}/view?{review_session.view_params}")
+    async def redirect_to_review_view(
+        review_session: ReviewSession = Depends(_require_review_session),
+    ) -> RedirectResponse:
+        return RedirectResponse(url=review_session.view_url)
 
-    @router.get("/review/{review_id}/view")
-    async def get_review_view(request: Request, review_id: str = Path(...)) -> FileResponse:
-        review_service = request.app.state.review_service
-        if not review_service.get_review_session(review_id):
-            raise HTTPException(status_code=404, detail="Review not found")
-        review_path = STATIC_DIR / "templates" / "review.html"
-        return FileResponse(review_path)
+    @router.get("/review/{review_id}/view", dependencies=[Depends(_require_review_session)])
+    async def get_review_view(request: Request) -> Response:
+        return review_page.response(request)
 
     @router.get("/review/{review_id}/api/info")
-    async def get_review_info(request: Request, review_id: str = Path(...)) -> ReviewInfo:
-        review_service = request.app.state.review_service
-        review_session = review_service.get_review_session(review_id)
-        if not review_session:
-            raise HTTPException(status_code=404, detail="Review not found")
-
+    async def get_review_info(review_session: ReviewSession = Depends(_require_review_session)) -> ReviewInfo:
         return ReviewInfo(
             review_id=review_session.id,
             title=review_session.title,
@@ -97,19 +270,18 @@ def create_review_router() -> APIRouter:
             created_at=review_session.created_at,
         )
 
-    @router.get("/review/{review_id}/api/diff")
+    @router.get("/review/{review_id}/api/diff", response_model=GitDiff, response_class=ModelJSONResponse)
     async def get_review_diff(
         request: Request,
-        review_id: str = Path(...),
+        review_session: ReviewSession = Depends(_require_review_session),
         commit: str | None = Query(None),
         range: str | None = Query(None),
         live: bool = Query(False),
         since: str | None = Query(None),
-    ) -> GitDiff:
-        review_service = request.app.state.review_service
-        review_session = review_service.get_review_session(review_id)
-        if not review_session:
-            raise HTTPException(status_code=404, detail="Review not found")
+        mock: bool = Query(False),
+    ) -> Response:
+        if mock:
+            return ModelJSONResponse(get_mock_diff())
 
         # Check if query parameters are provided - if so, use them to compute the diff
         param_count = sum(1 for p in [commit, range, live] if p)
@@ -120,28 +292,44 @@ def create_review_router() -> APIRouter:
                 detail="Cannot specify multiple parameters. Use exactly one of: commit, range, or live"
             )
 
+        # A commit, or a range between two commits, never changes once its
+        # refs are resolved to hashes, so it revalidates by those hashes
+        # without the diff being computed again.
+        git_service = review_session.git_service
+        resolved = None
         if commit:
-            return review_session.git_service.get_commit_diff(commit)
+            resolved = await run_in_threadpool(git_service.resolve_commit, commit)
         elif range:
-            return review_session.git_service.get_range_diff(range)
+            resolved = await run_in_threadpool(git_service.resolve_range, range)
+        etag = key_etag("commit" if commit else "range", resolved) if resolved else None
+        if etag is not None:
+            not_modified = not_modified_response(request, etag)
+            if not_modified is not None:
+                return not_modified
+        headers = {"ETag": etag, "Cache-Control": "no-cache"} if etag is not None else None
+
+        # Computing a diff runs git, so it happens in the threadpool rather
+        # than on the event loop.
+        if commit:
+            diff = await run_in_threadpool(git_service.get_commit_diff, resolved or commit)
+        elif range:
+            diff = await run_in_threadpool(git_service.get_range_diff, range, resolved)
         elif live:
             since_param = since or "HEAD"
-            return review_session.git_service.get_live_diff(since_param)
+            diff = await run_in_threadpool(git_service.get_live_diff, since_param)
         else:
-            # No query parameters provided, use the session's cached diff
-            return review_session.diff
-
-    @router.get("/review/{review_id}/api/diff/file")
-    async def get_single_file_diff(
-        request: Request,
-        review_id: str = Path(...),
+            # No query parameters provided, serve the session's diff from
+            # its cached encoding
+            content, etag = review_session.diff_json()
+            return etag_response(request, content, etag, "application/json")
+        return ModelJSONResponse(diff, headers=headers)
+
+    # Runs git, so this is a plain function that FastAPI runs in its threadpool.
+    @router.get("/review/{review_id}/api/diff/file", response_model=DiffFile, response_class=ModelJSONResponse)
+    def get_single_file_diff(
+        review_session: ReviewSession = Depends(_require_review_session),
         path: str = Query(..., description="File path relative to repo root"),
-    ) -> DiffFile:
-        review_service = request.app.state.review_service
-        review_session = review_service.get_review_session(review_id)
-        if not review_session:
-            raise HTTPException(status_code=404, detail="Review not found")
-
+    ) -> ModelJSONResponse:
         result = review_session.git_service.get_file_diff(
             path,
             commit=review_session.commit,
@@ -150,29 +338,41 @@ def create_review_router() -> APIRouter:
         )
         if result is None:
             raise HTTPException(status_code=404, detail="File not found in diff")
-        return result
+        return ModelJSONResponse(result)
 
-    @router.get("/review/{review_id}/api/comments")
+    @router.get("/review/{review_id}/api/comments", response_model=List[Comment])
     async def get_review_comments(
-        request: Request, review_id: str = Path(...), file_path: str | None = None
-    ) -> List[Comment]:
-        review_service = request.app.state.review_service
-        review_session = review_service.get_review_session(review_id)
-        if not review_session:
-            raise HTTPException(status_code=404, detail="Review not found")
-        return review_session.comment_service.get_comments(file_path=file_path)
+        request: Request,
+        review_session: ReviewSession = Depends(_require_review_session),
+        file_path: str | None = None,
+    ) -> Response:
+        comment_service = review_session.comment_service
+        # The version changes on every mutation, so an unchanged list
+        # revalidates without being serialized again.
+        etag = f'W/"{review_session.id}-{comment_service.version}"'
+        not_modified = not_modified_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        content = COMMENT_LIST_ADAPTER.dump_json(comment_service.get_comments(file_path=file_path))
+        return tagged_response(content, etag, "application/json")
 
     @router.post("/review/{review_id}/api/comments")
     async def create_review_comment(
-        request: Request, payload: CommentRequest, review_id: str = Path(...)
+        request: Request,
+        payload: CommentRequest,
+        review_id: str = Path(...),
+        review_session: ReviewSession = Depends(_require_review_session),
     ) -> SuccessResponse[dict]:
         review_service = request.app.state.review_service
         mcp_service = request.app.state.mcp_service
-        review_session = review_service.get_review_session(review_id)
-        if not review_session:
-            raise HTTPException(status_code=404, detail="Review not found")
+
+        # Refuse before storing the comment, so a rejected comment is not persisted
+        if not mcp_service.has_queue_capacity():
+            raise HTTPException(status_code=429, detail="Review comment backlog full")
 
         comment, queue_pos = review_session.comment_service.add_comment(payload, review_id)
+        review_service.register_comment(comment.id, review_session)
         mcp_service.add_comment_to_queue(comment)
 
         return SuccessResponse(
@@ -182,32 +382,28 @@ def create_review_router() -> APIRouter:
 
     @router.delete("/review/{review_id}/api/comments/{comment_id}")
     async def delete_review_comment(
-        request: Request, review_id: str = Path(...), comment_id: str = Path(...)
+        request: Request,
+        comment_id: str = Path(...),
+        review_session: ReviewSession = Depends(_require_review_session),
     ) -> SuccessResponse[dict]:
-        review_service = request.app.state.review_service
-        review_session = review_service.get_review_session(review_id)
-        if not review_session:
-            raise HTTPException(status_code=404, detail="Review not found")
-
         success = review_session.comment_service.delete_comment(comment_id)
         if not success:
             raise HTTPException(status_code=404, detail="Comment not found")
+        request.app.state.review_service.forget_comment(comment_id)
+        request.app.state.mcp_service.discard_comment(comment_id)
 
         return SuccessResponse(
             data={"comment_id": comment_id},
             message="Comment deleted successfully",
         )
 
-    @router.post("/review/{review_id}/approve")
+    @router.post("/review/{review_id}/approve", dependencies=[Depends(_require_review_session)])
     async def approve_review(
         request: Request, payload: ApprovalRequest, review_id: str = Path(...)
     ) -> SuccessResponse[dict]:
-        review_service = request.app.state.review_service
         mcp_service = request.app.state.mcp_service
         event_manager = request.app.state.event_manager
-        if not review_service.get_review_session(review_id):
-            raise HTTPException(status_code=404, detail="Review not found")
-        
+
         mcp_service.approve_review(review_id)
         await event_manager.emit_event(
             EventType.REVIEW_APPROVED,
@@ -219,116 +415,154 @@ def create_review_router() -> APIRouter:
             message=f"Review {review_id} has been approved successfully",
         )
 
+    # File access and the git subprocess below block, so this handler is a
+    # plain function that FastAPI runs in its threadpool.
     @router.get("/review/{review_id}/api/file-content")
-    async def get_review_file_content(
+    def get_review_file_content(
         request: Request,
-        review_id: str = Path(...),
+        review_session: ReviewSession = Depends(_require_review_session),
         path: str = Query(..., description="Path to the file relative to the repository root"),
         ref: str | None = Query(None, description="Git ref to read the file at (e.g. HEAD, commit SHA). If omitted, reads from the working tree."),
-    ) -> PlainTextResponse:
-        review_service = request.app.state.review_service
-        review_session = review_service.get_review_session(review_id)
-        if not review_session:
-            raise HTTPException(status_code=404, detail="Review not found")
-
-        repo_root = review_session.git_service.repo_path.resolve()
+    ) -> Response:
+        repo_root = review_session.git_service.repo_root
 
         if ref is not None:
             # Read file content at the given git ref
             file_path = _resolve_repo_path(repo_root, path)
             relative_path = file_path.relative_to(repo_root).as_posix()
+            etag = key_etag(ref, relative_path) if is_immutable_ref(ref) else None
+            if etag is not None:
+                not_modified = not_modified_response(request, etag)
+                if not_modified is not None:
+                    return not_modified
             try:
                 result = subprocess.run(
                     ["git", "show", f"{ref}:{relative_path}"],
                     cwd=str(repo_root),
                     capture_output=True,
-                    text=True,
                     check=True,
                 )
-                return PlainTextResponse(result.stdout)
             except subprocess.CalledProcessError:
                 raise HTTPException(status_code=404, detail=f"File not found at ref '{ref}'")
+
+            if not _starts_as_utf8(result.stdout):
+                raise HTTPException(status_code=415, detail="File is not a UTF-8 text file")
+
+            # Send git's output as-is rather than decoding and re-encoding it.
+            return Response(
+                result.stdout,
+                media_type="text/plain; charset=utf-8",
+                headers={"ETag": etag, "Cache-Control": "no-cache"} if etag is not None else None,
+            )
         else:
             file_path = _resolve_repo_path(repo_root, path)
 
-            if not file_path.exists():
-                raise HTTPException(status_code=404, detail="File not found")
-            if not file_path.is_file():
+            file_stat = _stat_repo_path(file_path)
+            if not stat.S_ISREG(file_stat.st_mode):
                 raise HTTPException(status_code=400, detail="Path is not a file")
 
-            try:
-                content = file_path.read_text(encoding="utf-8")
-            except UnicodeDecodeError:
-                raise HTTPException(status_code=415, detail="File is not a UTF-8 text file")
+            # Starlette's FileResponse sets an ETag but never answers 304, so
+            # revalidate here before probing or reading the file.
+            etag = f'W/"{file_stat.st_ino:x}-{file_stat.st_mtime_ns:x}-{file_stat.st_size:x}"'
+            not_modified = not_modified_response(request, etag)
+            if not_modified is not None:
+                return not_modified
 
-            return PlainTextResponse(content)
+            if not _looks_like_utf8(file_path):
+                raise HTTPException(status_code=415, detail="File is not a UTF-8 text file")
 
-    @router.post("/review/{review_id}/api/edit")
-    async def edit_review_file(
-        request: Request,
-        payload: FileEditRequest,
-        review_id: str = Path(...),
-    ) -> SuccessResponse[dict]:
-        review_service = request.app.state.review_service
-        review_session = review_service.get_review_session(review_id)
-        if not review_session:
-            raise HTTPException(status_code=404, detail="Review not found")
+            # Let Starlette stream the file (using sendfile where available)
+            # instead of decoding it into a string first.
+            return FileResponse(
+                file_path,
+                media_type="text/plain; charset=utf-8",
+                headers={"ETag": etag, "Cache-Control": "no-cache"},
+                stat_result=file_stat,
+            )
 
-        repo_root = review_session.git_service.repo_path.resolve()
+    def _edit_file(review_session: ReviewSession, payload: FileEditRequest) -> SuccessResponse[dict]:
+        """Apply an edit request to a file in the session's repository."""
+        repo_root = review_session.git_service.repo_root
         target_path = _resolve_repo_path(repo_root, payload.filename)
 
-        if not target_path.exists():
-            raise HTTPException(status_code=404, detail="File not found")
-        if target_path.is_dir():
+        target_stat = _stat_repo_path(target_path)
+        if stat.S_ISDIR(target_stat.st_mode):
             raise HTTPException(status_code=400, detail="Cannot edit a directory")
 
-        patch_lines = payload.patch.splitlines()
-        if len(patch_lines) < 2 or not patch_lines[0].startswith("--- ") or not patch_lines[1].startswith("+++ "):
+        # Only the two header lines are needed, so avoid splitting the whole patch.
+        header = payload.patch.split("\n", 2)[:2]
+        if len(header) < 2 or not header[0].startswith("--- ") or not header[1].startswith("+++ "):
             raise HTTPException(status_code=400, detail="Invalid patch format")
 
         relative_path = target_path.relative_to(repo_root).as_posix()
-        patch_lines[0] = f"--- a/{relative_path}"
-        patch_lines[1] = f"+++ b/{relative_path}"
-        sanitized_patch = "\n".join(patch_lines)
-        if payload.patch.endswith("\n"):
-            sanitized_patch += "\n"
-
-        try:
-            subprocess.run(
-                ["git", "apply", "--whitespace=nowarn", "-"],
-                input=sanitized_patch,
-                text=True,
-                cwd=str(repo_root),
-                capture_output=True,
-                check=True,
-            )
-        except subprocess.CalledProcessError as exc:
-            detail = exc.stderr.strip() or exc.stdout.strip() or "Unknown git apply error"
-            raise HTTPException(status_code=409, detail=f"Failed to apply patch: {detail}") from exc
 
-        if review_session.is_live:
-            review_session.refresh_diff()
+        # A resubmitted patch (retry, double click) that was already applied
+        # would now conflict. If the file is exactly as that edit left it,
+        # report the earlier success instead of patching again.
+        edit_key = (str(target_path), hashlib.blake2b(payload.patch.encode("utf-8"), digest_size=16).digest())
+        previous = recent_edits.get(edit_key)
+        if previous is not None and previous[:2] == (target_stat.st_mtime_ns, target_stat.st_size):
+            recent_edits.move_to_end(edit_key)
+            return previous[2]
+
+        if settings.use_system_patch:
+            _apply_patch_with_git(repo_root, relative_path, payload.patch)
+        else:
+            try:
+                apply_unified_diff(target_path, payload.patch)
+            except MalformedPatchError as exc:
+                raise HTTPException(status_code=400, detail=f"Invalid patch format: {exc}") from exc
+            except PatchError as exc:
+                raise HTTPException(status_code=409, detail=f"Failed to apply patch: {exc}") from exc
 
-        return SuccessResponse(
+        response: SuccessResponse[dict] = SuccessResponse(
             data={"filename": relative_path},
             message=f"File {relative_path} edited successfully",
         )
+        edited_stat = os.stat(target_path)
+        recent_edits[edit_key] = (edited_stat.st_mtime_ns, edited_stat.st_size, response)
+        if len(recent_edits) > RECENT_EDITS_SIZE:
+            recent_edits.popitem(last=False)
+        return response
+
+    @router.post("/review/{review_id}/api/edit", openapi_extra=FILE_EDIT_OPENAPI)
+    async def edit_review_file(
+        request: Request,
+        review_session: ReviewSession = Depends(_require_review_session),
+    ) -> SuccessResponse[dict]:
+        # Patches can be large, so validate the raw body with pydantic's JSON
+        # parser instead of letting FastAPI build an intermediate dict first.
+        try:
+            payload = FileEditRequest.model_validate_json(await request.body())
+        except ValidationError as exc:
+            raise RequestValidationError(
+                [{**error, "loc": ("body", *error["loc"])} for error in exc.errors(include_url=False)]
+            ) from exc
+
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(EDIT_EXECUTOR, _edit_file, review_session, payload)
+        # Refreshed from here rather than the edit thread, so the session's
+        # diff is only ever replaced on the loop that serves it
+        if review_session.is_live:
+            await review_session.refresh_diff_in_thread()
+        return response
 
     @router.websocket("/review/{review_id}/ws")
     async def websocket_endpoint(websocket: WebSocket, review_id: str = Path(...)) -> None:
         review_service = websocket.app.state.review_service
         event_manager = websocket.app.state.event_manager
         if not review_service.get_review_session(review_id):
-            await websocket.close(code=1008, reason="Review not found")
+            await websocket.close(code=1008, reason=REVIEW_NOT_FOUND)
             return
 
         await websocket.accept()
         subscriber = await event_manager.subscribe(review_id=review_id)
         try:
             while True:
-                events = await event_manager.wait_for_events(subscriber, timeout=30.0)
-                for event in events:
-                    await websocket.send_json(event.to_dict())
+                events = await event_manager.wait_for_events(subscriber, timeout=None)
+                if events:
+                    # One frame per batch, reusing each event's cached encoding
+                    await websocket.send_text(encode_event_batch(events).decode("utf-8"))
         except WebSocketDisconnect:
             pass
         finally:
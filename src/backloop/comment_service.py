@@ -1,15 +1,28 @@
-import json
+import os
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import Any, List, Dict, Tuple
+
+from pydantic_core import from_json, to_json
 
 from backloop.models import Comment, CommentRequest, CommentStatus
 from backloop.utils.state_dir import get_state_dir
 
+# The log is rewritten as a snapshot once it holds this many times more
+# records than there are live comments (and at least COMPACT_MIN_RECORDS).
+COMPACT_FACTOR = 4
+COMPACT_MIN_RECORDS = 64
+
 
 class CommentService:
-    """Service for managing comments on diff lines."""
+    """Service for managing comments on diff lines.
+
+    Comments are persisted as an append-only JSON Lines log: each mutation
+    appends a "put" record with the comment's new state or a "delete" record,
+    and loading replays the log. Queue positions are derived from queue order
+    on load, so removing a comment never rewrites the others.
+    """
 
     def __init__(
         self,
@@ -18,15 +31,32 @@ class CommentService:
         default_review_id: str | None = None,
     ) -> None:
         """Initialize with optional storage path and default review context."""
+        # The default store was a single JSON object before it became a log;
+        # it is read once if no log exists yet.
+        self._legacy_path: Path | None = None
         if storage_path:
             self.storage_path = Path(storage_path)
         else:
-            self.storage_path = get_state_dir() / "backloop_comments.json"
+            self.storage_path = get_state_dir() / "backloop_comments.jsonl"
+            self._legacy_path = get_state_dir() / "backloop_comments.json"
         self._default_review_id = default_review_id or "default"
+        self._log_records = 0
+        # Set while loading if the log must be rewritten before anything is
+        # appended to it, e.g. because it ends in a torn record.
+        self._rewrite_log = False
         self._comments: Dict[str, Comment] = self._load_comments()
         self._comment_queue: List[str] = (
             self._rebuild_queue()
         )  # Rebuild queue from loaded comments
+        self._update_queue_positions()
+        if self._rewrite_log:
+            self._save_comments()
+        self._version = 0
+
+    @property
+    def version(self) -> int:
+        """A counter that changes whenever any comment is added, changed or removed."""
+        return self._version
 
     def set_default_review_id(self, review_id: str) -> None:
         """Update the default review identifier used when callers omit it."""
@@ -60,7 +90,7 @@ class CommentService:
         )
 
         self._comments[comment_id] = comment
-        self._save_comments()
+        self._append_records(self._put_record(comment))
         return comment, queue_position
 
     def get_comments(self, file_path: str | None = None) -> List[Comment]:
@@ -80,7 +110,7 @@ class CommentService:
         if comment:
             comment.content = content
             comment.timestamp = datetime.now().isoformat()
-            self._save_comments()
+            self._append_records(self._put_record(comment))
         return comment
 
     def delete_comment(self, comment_id: str) -> bool:
@@ -88,11 +118,10 @@ class CommentService:
         if comment_id in self._comments:
             del self._comments[comment_id]
             # Remove from queue if present
-            if comment_id in self._comment_queue:
-                self._comment_queue.remove(comment_id)
+            if self._discard_from_queue(comment_id):
                 # Recalculate positions for remaining comments
                 self._update_queue_positions()
-            self._save_comments()
+            self._append_records({"op": "delete", "id": comment_id})
             return True
         return False
 
@@ -118,22 +147,29 @@ class CommentService:
                 comment.queue_position = None
             if reply_message is not None:
                 comment.reply_message = reply_message
-            self._save_comments()
+            self._append_records(self._put_record(comment))
         return comment
 
     def remove_comment_from_queue(self, comment_id: str) -> bool:
         """Remove a comment from the queue and return True if it was removed."""
-        if comment_id in self._comment_queue:
-            self._comment_queue.remove(comment_id)
+        if self._discard_from_queue(comment_id):
             comment = self._comments.get(comment_id)
             if comment:
                 comment.queue_position = None
+                self._append_records(self._put_record(comment))
             # Update positions for remaining comments
             self._update_queue_positions()
-            self._save_comments()
             return True
         return False
 
+    def _discard_from_queue(self, comment_id: str) -> bool:
+        """Remove a comment from the queue with a single scan, if present."""
+        try:
+            self._comment_queue.remove(comment_id)
+        except ValueError:
+            return False
+        return True
+
     def _update_queue_positions(self) -> None:
         """Update queue positions for all comments in the queue."""
         for position, comment_id in enumerate(self._comment_queue):
@@ -153,31 +189,85 @@ class CommentService:
         return [comment_id for comment_id, _ in queued_comments]
 
     def _load_comments(self) -> Dict[str, Comment]:
-        """Load comments from storage."""
+        """Load comments by replaying the storage log.
+
+        Replay stops at the first unreadable record, which is what a write
+        torn by a crash leaves behind. The log is then rewritten from the
+        records before it, so later appends do not land after the damage.
+        """
+        comments: Dict[str, Comment] = {}
         if not self.storage_path.exists():
+            return self._load_legacy_comments()
+
+        with open(self.storage_path, "rb") as f:
+            for line in f:
+                try:
+                    # Every record is written with its newline, so one
+                    # without it was cut short.
+                    if not line.endswith(b"\n"):
+                        raise ValueError("truncated record")
+                    record = from_json(line)
+                    if record["op"] == "put":
+                        comment = Comment(**record["comment"])
+                        comments[comment.id] = comment
+                    elif record["op"] == "delete":
+                        comments.pop(record["id"], None)
+                    else:
+                        raise ValueError(f"unknown op {record['op']!r}")
+                except (KeyError, TypeError, ValueError):
+                    self._rewrite_log = True
+                    break
+                self._log_records += 1
+        return comments
+
+    def _load_legacy_comments(self) -> Dict[str, Comment]:
+        """Read comments from the JSON object the default store used to be."""
+        if self._legacy_path is None or not self._legacy_path.exists():
             return {}
 
         try:
-            with open(self.storage_path, "r") as f:
-                data = json.load(f)
-                return {
-                    comment_id: Comment(**comment_data)
-                    for comment_id, comment_data in data.items()
-                }
-        except (json.JSONDecodeError, KeyError, TypeError):
+            with open(self._legacy_path, "rb") as f:
+                data = from_json(f.read())
+            comments = {
+                comment_id: Comment(**comment_data)
+                for comment_id, comment_data in data.items()
+            }
+        except (AttributeError, KeyError, TypeError, ValueError):
             # If file is corrupted, start fresh
             return {}
+        self._rewrite_log = True
+        return comments
+
+    @staticmethod
+    def _put_record(comment: Comment) -> Dict[str, Any]:
+        """Build a log record holding the current state of a comment."""
+        return {"op": "put", "comment": comment}
+
+    def _append_records(self, *records: Dict[str, Any]) -> None:
+        """Append mutation records to the storage log.
+
+        Every mutation ends here, so this is also where the version is bumped.
+        """
+        self._version += 1
+
+        self._log_records += len(records)
+        if self._log_records > max(COMPACT_MIN_RECORDS, COMPACT_FACTOR * len(self._comments)):
+            self._save_comments()
+            return
 
-    def _save_comments(self) -> None:
-        """Save comments to storage."""
         # Ensure parent directory exists
         self.storage_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Convert comments to serializable format
-        data = {
-            comment_id: comment.model_dump()
-            for comment_id, comment in self._comments.items()
-        }
+        with open(self.storage_path, "ab") as f:
+            f.write(b"".join(to_json(record) + b"\n" for record in records))
+
+    def _save_comments(self) -> None:
+        """Compact the storage log into one record per live comment."""
+        # Ensure parent directory exists
+        self.storage_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(self.storage_path, "w") as f:
-            json.dump(data, f, indent=2)
+        tmp_path = self.storage_path.with_name(f".{self.storage_path.name}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(b"".join(to_json(self._put_record(comment)) + b"\n" for comment in self._comments.values()))
+        os.replace(tmp_path, self.storage_path)
+        self._log_records = len(self._comments)
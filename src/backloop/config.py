@@ -2,6 +2,7 @@
 
 import os
 import warnings
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 from pydantic import Field, field_validator, model_validator
@@ -65,6 +66,22 @@ class Settings(BaseSettings):
         ge=1,
     )
 
+    max_pending_comments: int = Field(
+        default=1024,
+        description="Maximum number of comments waiting to be picked up by the agent",
+        ge=1,
+    )
+
+    compress_responses: bool = Field(
+        default=False,
+        description="Gzip larger responses, useful when the UI is reached over a tunnel",
+    )
+
+    use_system_patch: bool = Field(
+        default=False,
+        description="Apply file edits with `git apply` instead of the built-in patcher",
+    )
+
     # Static files configuration
     static_dir: Optional[Path] = Field(
         default=None,
@@ -86,21 +103,34 @@ class Settings(BaseSettings):
     @model_validator(mode="after")
     def warn_unknown_backloop_vars(self) -> "Settings":
         """Warn about unknown BACKLOOP_ prefixed environment variables."""
-        known_fields = {name.upper() for name in self.model_fields.keys()}
+        unknown_vars = [
+            env_var
+            for env_var in os.environ
+            if env_var.startswith("BACKLOOP_") and env_var.upper() not in KNOWN_ENV_VARS
+        ]
+        if not unknown_vars:
+            return self
+
+        valid_vars = ", ".join(sorted(KNOWN_ENV_VARS))
+        for env_var in unknown_vars:
+            warnings.warn(
+                f"Unknown environment variable '{env_var}' will be ignored. "
+                f"Valid BACKLOOP_ variables are: {valid_vars}",
+                UserWarning,
+                stacklevel=2,
+            )
+
+        return self
 
-        for env_var in os.environ:
-            if env_var.startswith("BACKLOOP_"):
-                field_name = env_var[9:]
 
-                if field_name.upper() not in known_fields:
-                    warnings.warn(
-                        f"Unknown environment variable '{env_var}' will be ignored. "
-                        f"Valid BACKLOOP_ variables are: {', '.join(sorted('BACKLOOP_' + name.upper() for name in self.model_fields.keys()))}",
-                        UserWarning,
-                        stacklevel=2,
-                    )
+# Environment variable names accepted by Settings, derived once from its fields.
+KNOWN_ENV_VARS = frozenset("BACKLOOP_" + name.upper() for name in Settings.model_fields)
 
-        return self
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings, parsing the environment only once."""
+    return Settings()
 
 
-settings = Settings()
+settings = get_settings()
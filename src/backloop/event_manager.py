@@ -1,11 +1,12 @@
 import asyncio
 import time
-from typing import Dict, List, Any, Set
+from typing import Dict, List, Any
 from dataclasses import dataclass, field
-from datetime import datetime
 from enum import Enum
 import uuid
 
+import pydantic_core
+
 
 class EventType(Enum):
     """Types of server-side events."""
@@ -19,7 +20,7 @@ class EventType(Enum):
     REVIEW_UPDATED = "review_updated"
 
 
-@dataclass
+@dataclass(slots=True)
 class Event:
     """Represents a server-side event."""
 
@@ -28,6 +29,7 @@ class Event:
     data: Dict[str, Any]
     timestamp: float
     review_id: str | None = None
+    _json: bytes | None = field(default=None, init=False, repr=False, compare=False)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert event to dictionary for JSON serialization."""
@@ -39,8 +41,23 @@ class Event:
             "review_id": self.review_id,
         }
 
+    def to_json(self) -> bytes:
+        """Encode the event as JSON.
+
+        Events are not modified after being emitted, so the encoding is cached
+        and shared by every subscriber the event is delivered to.
+        """
+        if self._json is None:
+            self._json = pydantic_core.to_json(self.to_dict())
+        return self._json
+
+
+def encode_event_batch(events: List[Event]) -> bytes:
+    """Encode events as a single {"events": [...]} JSON document."""
+    return b'{"events":[' + b",".join(event.to_json() for event in events) + b"]}"
+
 
-@dataclass
+@dataclass(slots=True)
 class EventSubscriber:
     """Represents a subscriber waiting for events."""
 
@@ -146,31 +163,25 @@ class EventManager:
             self._subscribers.pop(subscriber_id, None)
 
     async def wait_for_events(
-        self, subscriber: EventSubscriber, timeout: float = 30.0
+        self, subscriber: EventSubscriber, timeout: float | None = 30.0
     ) -> List[Event]:
         """Wait for events for a subscriber.
 
         Args:
             subscriber: The subscriber to wait for
-            timeout: Maximum time to wait in seconds
+            timeout: Maximum time to wait in seconds, or None to wait until
+                an event arrives
 
         Returns:
             List of events (may be empty if timeout)
         """
         # If there are already events, return them immediately
-        if subscriber.events:
-            events = subscriber.events[:]
-            subscriber.events.clear()
-            if events:
-                subscriber.last_event_id = events[-1].id
-            return events
-
-        # Wait for new events with timeout
-        try:
-            await asyncio.wait_for(subscriber.event.wait(), timeout=timeout)
-        except asyncio.TimeoutError:
-            # Timeout is normal for long-polling
-            pass
+        if not subscriber.events:
+            try:
+                await asyncio.wait_for(subscriber.event.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                # Timeout is normal for long-polling
+                pass
 
         # Clear the event flag
         subscriber.event.clear()
@@ -1,46 +1,44 @@
 import asyncio
-import time
+import os
 import threading
+import time
 from pathlib import Path
-from typing import Set, Dict, Any, Callable, Awaitable
-from watchdog.observers import Observer
-from watchdog.observers.api import BaseObserver, ObservedWatch
-from watchdog.events import (
-    FileSystemEventHandler,
-    FileModifiedEvent,
-    FileCreatedEvent,
-    FileDeletedEvent,
-    FileSystemEvent,
-)
+from typing import Dict, Set, Tuple
+from watchfiles import Change, awatch
 from backloop.event_manager import EventManager, EventType
 from backloop.utils.common import debug_write
 import pathspec
 
+# watchfiles collects changes on its Rust side and hands them over as one
+# batch once no events have arrived for WATCH_STEP_MS, holding a batch for at
+# most WATCH_DEBOUNCE_MS.
+WATCH_STEP_MS = 100
+WATCH_DEBOUNCE_MS = 1000
 
-class ReviewFileSystemEventHandler(FileSystemEventHandler):
-    """File system event handler for the review system."""
 
-    def __init__(
-        self,
-        event_manager: EventManager,
-        loop: asyncio.AbstractEventLoop,
-        repo_root: Path,
-        gitignore_spec: pathspec.PathSpec | None = None,
-    ) -> None:
-        """Initialize the handler.
+class ReviewWatchFilter:
+    """Filter deciding which file changes the review system reacts to."""
+
+    def __init__(self, repo_root: Path, gitignore_spec: pathspec.PathSpec | None = None) -> None:
+        """Initialize the filter.
 
         Args:
-            event_manager: Event manager to emit file change events
-            loop: Event loop to use for scheduling coroutines
             repo_root: Root directory of the repository
             gitignore_spec: Compiled gitignore patterns (optional)
         """
-        self.event_manager = event_manager
-        self.loop = loop
         self.repo_root = repo_root
         self.gitignore_spec = gitignore_spec
-        self._last_event_times: Dict[str, float] = {}
-        self._debounce_time = 0.5  # Debounce events within 500ms
+
+    def __call__(self, change: Change, path: str) -> bool:
+        """Return True for changes to files that are not gitignored."""
+        # A deleted path cannot be told apart from a directory any more, but
+        # removing a directory also reports each file that was in it.
+        if change != Change.deleted and os.path.isdir(path):
+            return False
+        if self._is_gitignored(path):
+            debug_write("[DEBUG] Skipping gitignored file: %s", path)
+            return False
+        return True
 
     def _is_gitignored(self, file_path: str) -> bool:
         """Check if a file is gitignored."""
@@ -51,79 +49,10 @@ class ReviewFileSystemEventHandler(FileSystemEventHandler):
             # Convert absolute path to relative path from repo root
             rel_path = Path(file_path).relative_to(self.repo_root)
             return self.gitignore_spec.match_file(str(rel_path))
-        except (ValueError, OSError):
-            # File is outside repo or other error, don't filter it
-            return False
-
-    def _should_emit_event(self, file_path: str) -> bool:
-        """Check if we should emit an event for this file change."""
-        # Check if file is gitignored
-        if self._is_gitignored(file_path):
+        except ValueError:
+            # File is outside repo, don't filter it
             return False
 
-        current_time = time.time()
-        last_time = self._last_event_times.get(file_path, 0)
-
-        if current_time - last_time < self._debounce_time:
-            return False
-
-        self._last_event_times[file_path] = current_time
-        return True
-
-    def on_modified(self, event: FileSystemEvent) -> None:
-        """Handle file modification events."""
-        if isinstance(event, FileModifiedEvent) and not event.is_directory:
-            abs_path = str(Path(str(event.src_path)).resolve())
-            debug_write(f"[DEBUG] File modification detected: {abs_path}")
-
-            if self._should_emit_event(abs_path):
-                # Convert to relative path from repo root
-                try:
-                    rel_path = str(Path(abs_path).relative_to(self.repo_root))
-                except ValueError:
-                    # File is outside repo, use absolute path
-                    rel_path = abs_path
-
-                debug_write(f"[DEBUG] Emitting FILE_CHANGED event for: {rel_path}")
-                asyncio.run_coroutine_threadsafe(
-                    self.event_manager.emit_event(
-                        EventType.FILE_CHANGED,
-                        {
-                            "file_path": rel_path,
-                            "event_type": "modified",
-                            "timestamp": time.time(),
-                        },
-                    ),
-                    self.loop,
-                )
-            else:
-                debug_write(f"[DEBUG] Skipping event for: {abs_path} (gitignored or debounced)")
-
-    def on_deleted(self, event: FileSystemEvent) -> None:
-        """Handle file deletion events."""
-        if isinstance(event, FileDeletedEvent) and not event.is_directory:
-            abs_path = str(Path(str(event.src_path)).resolve())
-
-            if self._should_emit_event(abs_path):
-                # Convert to relative path from repo root
-                try:
-                    rel_path = str(Path(abs_path).relative_to(self.repo_root))
-                except ValueError:
-                    # File is outside repo, use absolute path
-                    rel_path = abs_path
-
-                asyncio.run_coroutine_threadsafe(
-                    self.event_manager.emit_event(
-                        EventType.FILE_REMOVED,
-                        {
-                            "file_path": rel_path,
-                            "event_type": "deleted",
-                            "timestamp": time.time(),
-                        },
-                    ),
-                    self.loop,
-                )
-
 
 class FileWatcher:
     """Watches files for changes and emits events."""
@@ -135,13 +64,15 @@ class FileWatcher:
 
         Args:
             event_manager: Event manager to emit file change events
-            loop: Event loop to use for scheduling coroutines
+            loop: Event loop to run the watcher on
         """
         self.event_manager = event_manager
         self.loop = loop
-        self.observer: BaseObserver | None = None
-        self.watch_handles: Dict[str, ObservedWatch] = {}  # Directory -> watch handle
-        self._is_watching = False
+        self._watch_task: asyncio.Task | None = None
+        # A threading.Event so stop() works from any thread; the Rust side
+        # checks it between steps. Each run gets its own, so starting again
+        # cannot clear a stop the previous run has not seen yet.
+        self._stop_event: threading.Event | None = None
 
     def _load_gitignore(self, directory: Path) -> pathspec.PathSpec | None:
         """Load and parse .gitignore file if it exists.
@@ -167,36 +98,74 @@ class FileWatcher:
     def start_watching(self, directory: str) -> None:
         """Start watching a directory for changes.
 
+        Must be called from the watcher's event loop.
+
         Args:
             directory: Directory path to watch recursively
         """
-        if self._is_watching:
+        if self._watch_task is not None:
             return
 
-        if self.observer is None:
-            self.observer = Observer()
-            self.observer.start()
+        repo_root = Path(directory).resolve()
+        watch_filter = ReviewWatchFilter(repo_root, self._load_gitignore(repo_root))
 
-        # Load .gitignore patterns
-        dir_path = Path(directory)
-        gitignore_spec = self._load_gitignore(dir_path)
-
-        handler = ReviewFileSystemEventHandler(
-            self.event_manager, self.loop, dir_path, gitignore_spec
+        self._stop_event = threading.Event()
+        self._watch_task = self.loop.create_task(
+            self._watch(repo_root, watch_filter, self._stop_event)
         )
+        debug_write("[DEBUG] Started watching directory: %s", directory)
+
+    async def _watch(
+        self, repo_root: Path, watch_filter: ReviewWatchFilter, stop_event: threading.Event
+    ) -> None:
+        """Emit events for every batch of changes reported by watchfiles."""
         try:
-            watch_handle = self.observer.schedule(handler, directory, recursive=True)
-            self.watch_handles[directory] = watch_handle
-            self._is_watching = True
-            debug_write(f"[DEBUG] Started watching directory: {directory}")
+            async for changes in awatch(
+                repo_root,
+                watch_filter=watch_filter,
+                step=WATCH_STEP_MS,
+                debounce=WATCH_DEBOUNCE_MS,
+                stop_event=stop_event,
+            ):
+                await self._emit_changes(repo_root, changes)
         except Exception as e:
-            debug_write(f"[ERROR] Could not watch directory {directory}: {e}")
+            debug_write("[ERROR] Could not watch directory %s: %s", repo_root, e)
+
+    async def _emit_changes(self, repo_root: Path, changes: Set[Tuple[Change, str]]) -> None:
+        """Emit one event per path in a batch of changes.
+
+        The batch is unordered, so a path only counts as removed if it was
+        deleted and not re-created (as editors do when saving via rename).
+        """
+        by_path: Dict[str, Set[Change]] = {}
+        for change, path in changes:
+            by_path.setdefault(path, set()).add(change)
+
+        debug_write("[DEBUG] Emitting file events for %d paths", len(by_path))
+        timestamp = time.time()
+        for path, kinds in by_path.items():
+            removed = Change.deleted in kinds and Change.added not in kinds
+            try:
+                rel_path = str(Path(path).relative_to(repo_root))
+            except ValueError:
+                # File is outside repo, use absolute path
+                rel_path = path
+            await self.event_manager.emit_event(
+                EventType.FILE_REMOVED if removed else EventType.FILE_CHANGED,
+                {
+                    "file_path": rel_path,
+                    "event_type": "deleted" if removed else "modified",
+                    "timestamp": timestamp,
+                },
+            )
 
     def stop(self) -> None:
         """Stop the file watcher."""
-        if self.observer:
-            self.observer.stop()
-            self.observer.join()
-            self.observer = None
-        self.watch_handles.clear()
-        self._is_watching = False
+        if self._stop_event is not None:
+            self._stop_event.set()
+        if self._watch_task is not None and not self.loop.is_closed():
+            # Cancelled rather than left to notice the stop event, which the
+            # Rust side only checks between steps
+            self.loop.call_soon_threadsafe(self._watch_task.cancel)
+        self._watch_task = None
+        self._stop_event = None
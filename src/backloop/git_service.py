@@ -1,11 +1,40 @@
 import subprocess
 import re
-from typing import List, Dict, Any
+import tempfile
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List
 from pathlib import Path
 
 from backloop.models import GitDiff, DiffFile, DiffChunk, DiffLine, LineType
 from backloop.utils.common import get_base_directory
 
+# Refs matching this can never point at different content, so diffs
+# computed for them are safe to cache. Only full SHA-1 or SHA-256 hashes
+# count: an abbreviated hash could just as well be a branch or tag name.
+IMMUTABLE_REF_RE = re.compile(r"^(?:[0-9a-f]{40}|[0-9a-f]{64})$")
+
+# Line patterns used when parsing `git diff` output.
+SUBMODULE_HEADER_RE = re.compile(r"Submodule (\S+) (?:contains |[0-9a-f]+)")
+DIFF_GIT_RE = re.compile(r"diff --git a/(.*) b/(.*)")
+HUNK_HEADER_RE = re.compile(r"@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+# First characters of context, deletion and addition lines within a hunk.
+DIFF_LINE_PREFIXES = frozenset(" -+")
+
+
+def is_immutable_ref(ref: str) -> bool:
+    """Check whether a commit or range consists only of commit hashes."""
+    return all(IMMUTABLE_REF_RE.match(part) for part in ref.split(".."))
+
+
+@lru_cache(maxsize=64)
+def _cached_commit_diff(repo_path: Path, commit_hash: str) -> GitDiff:
+    return GitService(str(repo_path))._compute_commit_diff(commit_hash)
+
+
+@lru_cache(maxsize=64)
+def _cached_range_diff(repo_path: Path, commit_range: str) -> GitDiff:
+    return GitService(str(repo_path))._compute_range_diff(commit_range)
+
 
 class GitService:
     """Service for interacting with git repositories."""
@@ -18,27 +47,51 @@ class GitService:
             # Auto-detect git repository root
             self.repo_path = get_base_directory()
 
+    @property
+    def repo_path(self) -> Path:
+        """Path to the repository."""
+        return self._repo_path
+
+    @repo_path.setter
+    def repo_path(self, value: Path) -> None:
+        self._repo_path = value
+        self._repo_root: Path | None = None
+
+    @property
+    def repo_root(self) -> Path:
+        """The repository path with symlinks resolved, computed once per path."""
+        if self._repo_root is None:
+            self._repo_root = self._repo_path.resolve()
+        return self._repo_root
+
     def get_commit_diff(self, commit_hash: str) -> GitDiff:
-        """Get diff for a specific commit."""
-        # Get commit info
-        info_cmd = [
+        """Get diff for a specific commit.
+
+        Diffs are cached by commit hash since they cannot change. Symbolic
+        refs are resolved first, so reopening a review of e.g. HEAD reuses
+        the cached diff until the ref moves.
+        """
+        resolved = self.resolve_commit(commit_hash)
+        if resolved is None:
+            return self._compute_commit_diff(commit_hash)
+        return _cached_commit_diff(self.repo_path, resolved)
+
+    def _compute_commit_diff(self, commit_hash: str) -> GitDiff:
+        # A single git show prints the commit info on the first line,
+        # NUL-separated, followed directly by the diff.
+        diff_cmd = [
             "git",
             "show",
-            "--pretty=format:%H|%an|%s",
-            "--no-patch",
+            "--pretty=format:%H%x00%an%x00%s",
+            "--submodule=diff",
             commit_hash,
         ]
-        info_result = self._run_git_command(info_cmd)
-        commit_parts = (
-            info_result.strip().split("|") if info_result.strip() else ["", "", ""]
-        )
+        lines = self._iter_git_lines(diff_cmd)
+        info_line = next(lines, "")
+        commit_parts = info_line.split("\0") if info_line else ["", "", ""]
         commit_info = [part if part else None for part in commit_parts]
 
-        # Get the actual diff
-        diff_cmd = ["git", "show", "--pretty=format:", "--submodule=diff", commit_hash]
-        diff_output = self._run_git_command(diff_cmd)
-
-        files = self._parse_diff_output(diff_output)
+        files = self._parse_diff_lines(lines)
 
         return GitDiff(
             files=files,
@@ -47,31 +100,83 @@ class GitService:
             message=commit_info[2],
         )
 
-    def get_range_diff(self, commit_range: str) -> GitDiff:
-        """Get diff for a commit range (e.g., 'main..feature')."""
+    def get_range_diff(self, commit_range: str, resolved: str | None = None) -> GitDiff:
+        """Get diff for a commit range (e.g., 'main..feature').
+
+        Like commit diffs, ranges between two commits are cached by the
+        hashes they resolve to. Anything else, such as a single ref that is
+        diffed against the working tree, is computed every time. A caller
+        that already ran resolve_range can pass its result as ``resolved``,
+        so the diff matches exactly those hashes.
+        """
+        if resolved is None:
+            resolved = self.resolve_range(commit_range)
+        if resolved is None:
+            return self._compute_range_diff(commit_range)
+        diff = _cached_range_diff(self.repo_path, resolved)
+        if resolved != commit_range:
+            # Keep the description in terms of the refs the user asked for.
+            diff = diff.model_copy(
+                update={"message": self._describe_range(commit_range)}
+            )
+        return diff
+
+    def _compute_range_diff(self, commit_range: str) -> GitDiff:
         # Get diff for commit range
         diff_cmd = ["git", "diff", "--submodule=diff", commit_range]
-        diff_output = self._run_git_command(diff_cmd)
+        files = self._parse_diff_lines(self._iter_git_lines(diff_cmd))
+        description = self._describe_range(commit_range)
+
+        return GitDiff(files=files, commit_hash=None, author=None, message=description)
 
+    @staticmethod
+    def _describe_range(commit_range: str) -> str:
         # Parse range to get info
         if ".." in commit_range:
             from_ref, to_ref = commit_range.split("..", 1)
-            description = f"Range: {from_ref}..{to_ref}"
-        else:
-            description = f"Range: {commit_range}"
+            return f"Range: {from_ref}..{to_ref}"
+        return f"Range: {commit_range}"
 
-        files = self._parse_diff_output(diff_output)
+    def resolve_commit(self, ref: str) -> str | None:
+        """Resolve a commit ref to its full hash, or None if it cannot be."""
+        return self._rev_parse_commits([ref])
 
-        return GitDiff(files=files, commit_hash=None, author=None, message=description)
+    def resolve_range(self, commit_range: str) -> str | None:
+        """Resolve a two-dot range between two commits to full hashes.
+
+        Returns None for anything that is not such a range, including a
+        single ref (which git diffs against the working tree) and
+        three-dot ranges.
+        """
+        parts = commit_range.split("..")
+        if len(parts) != 2 or "..." in commit_range:
+            return None
+        return self._rev_parse_commits(parts)
+
+    def _rev_parse_commits(self, refs: List[str]) -> str | None:
+        """Resolve refs to full commit hashes joined by "..", or None."""
+        if all(IMMUTABLE_REF_RE.match(ref) for ref in refs):
+            return "..".join(refs)
+        if not all(refs) or any(ref.startswith("-") for ref in refs):
+            return None
+        try:
+            output = self._run_git_command(
+                ["git", "rev-parse", *(f"{ref}^{{commit}}" for ref in refs)]
+            )
+        except RuntimeError:
+            return None
+        hashes = output.split()
+        if len(hashes) != len(refs):
+            return None
+        return "..".join(hashes)
 
     def get_live_diff(self, since_commit: str = "HEAD") -> GitDiff:
         """Get diff between current filesystem state and a commit."""
         # Get diff from commit to working directory (includes staged + unstaged)
         diff_cmd = ["git", "diff", "--submodule=diff", since_commit]
-        diff_output = self._run_git_command(diff_cmd)
+        files = self._parse_diff_lines(self._iter_git_lines(diff_cmd))
 
         description = f"Live changes since {since_commit}"
-        files = self._parse_diff_output(diff_output)
 
         # Add untracked files
         untracked_files = self._get_untracked_files()
@@ -359,41 +464,127 @@ class GitService:
             )
             return result.stdout
         except subprocess.CalledProcessError as e:
-            # Handle case where file doesn't exist in commit
-            if "does not exist" in e.stderr or "bad revision" in e.stderr:
-                return ""
-            raise RuntimeError(f"Git command failed: {' '.join(cmd)}: {e.stderr}")
+            self._check_git_error(cmd, e.stderr)
+            return ""
+
+    def _iter_git_lines(self, cmd: List[str]) -> Iterator[str]:
+        """Run a git command and yield its output lines as they are produced.
+
+        Output is read as bytes and each line decoded once as UTF-8, so file
+        content in another encoding shows up with replacement characters
+        instead of failing the whole diff. Line endings are stripped, CRLF
+        included.
+
+        Failures are handled like in _run_git_command, with a missing file
+        or revision yielding no lines.
+        """
+        # stderr goes to a file rather than a pipe: git can write far more
+        # than a pipe buffer there (e.g. one CRLF warning per file), and
+        # would block on it while stdout is still being read.
+        with tempfile.TemporaryFile() as stderr_file:
+            with subprocess.Popen(
+                cmd,
+                cwd=self.repo_path,
+                stdout=subprocess.PIPE,
+                stderr=stderr_file,
+            ) as proc:
+                assert proc.stdout is not None
+                for line in proc.stdout:
+                    if line.endswith(b"\n"):
+                        line = line[:-2] if line.endswith(b"\r\n") else line[:-1]
+                    yield line.decode("utf-8", "replace")
+            if proc.returncode:
+                stderr_file.seek(0)
+                stderr = stderr_file.read().decode("utf-8", "replace")
+                self._check_git_error(cmd, stderr)
+
+    @staticmethod
+    def _check_git_error(cmd: List[str], stderr: str) -> None:
+        """Raise for a failed git command unless it hit a missing file or revision."""
+        # Handle case where file doesn't exist in commit
+        if "does not exist" in stderr or "bad revision" in stderr:
+            return
+        raise RuntimeError(f"Git command failed: {' '.join(cmd)}: {stderr}")
 
     def _parse_diff_output(self, diff_output: str) -> List[DiffFile]:
         """Parse git diff output into structured data."""
+        return self._parse_diff_lines(diff_output.split("\n"))
+
+    def _parse_diff_lines(self, lines: Iterable[str]) -> List[DiffFile]:
+        """Parse git diff output lines into structured data.
+
+        Lines are consumed one at a time, so output streamed from git is
+        parsed without holding all of it in memory.
+        """
         files = []
         current_file: Dict[str, Any] | None = None
         current_chunk: Dict[str, Any] | None = None
+        # Line numbers and line list of the open chunk, kept in locals since
+        # they are touched for every body line.
+        cur_old = cur_new = 0
+        cur_lines: List[Dict[str, Any]] = []
         current_submodule: str | None = None
         # Track submodule headers that had no expanded diffs following them
         # so we can create placeholder entries for them.
         pending_submodule_headers: List[tuple[str, str]] = []  # (path, header_line)
 
-        lines = diff_output.split("\n")
-        i = 0
+        for line in lines:
+            first = line[:1]
+
+            # Diff lines. They make up nearly all of the output, so they are
+            # recognised by their first character before any header check.
+            # Header lines never start with these while a chunk is open.
+            if current_chunk is not None and first in DIFF_LINE_PREFIXES:
+                if first == " ":
+                    # Context line
+                    cur_lines.append(
+                        {
+                            "type": LineType.CONTEXT,
+                            "oldNum": cur_old,
+                            "newNum": cur_new,
+                            "content": line[1:],  # Remove prefix
+                        }
+                    )
+                    cur_old += 1
+                    cur_new += 1
+
+                elif first == "-":
+                    # Deletion
+                    cur_lines.append(
+                        {
+                            "type": LineType.DELETION,
+                            "oldNum": cur_old,
+                            "newNum": None,
+                            "content": line[1:],  # Remove prefix
+                        }
+                    )
+                    cur_old += 1
+                    if current_file:
+                        current_file["deletions"] += 1
 
-        while i < len(lines):
-            line = lines[i]
+                else:
+                    # Addition
+                    cur_lines.append(
+                        {
+                            "type": LineType.ADDITION,
+                            "oldNum": None,
+                            "newNum": cur_new,
+                            "content": line[1:],  # Remove prefix
+                        }
+                    )
+                    cur_new += 1
+                    if current_file:
+                        current_file["additions"] += 1
 
             # Submodule header from --submodule=diff output
-            submodule_match = re.match(
-                r"Submodule (\S+) (?:contains |[0-9a-f]+)", line
-            )
-            if submodule_match:
+            elif first == "S" and (submodule_match := SUBMODULE_HEADER_RE.match(line)):
                 current_submodule = submodule_match.group(1)
                 # Track this header; it will be removed from the pending
                 # list if we see expanded diffs or a pointer diff for it.
                 pending_submodule_headers.append((current_submodule, line))
-                i += 1
-                continue
 
             # File header
-            if line.startswith("diff --git"):
+            elif line.startswith("diff --git"):
                 if current_file:
                     # Finalize any pending chunk before finalizing the file
                     if current_chunk:
@@ -404,7 +595,7 @@ class GitService:
                     files.append(self._finalize_file(current_file))
 
                 # Parse file paths
-                match = re.match(r"diff --git a/(.*) b/(.*)", line)
+                match = DIFF_GIT_RE.match(line)
                 if match:
                     file_path = match.group(2)
                     # Reset submodule tracking if this file isn't inside
@@ -452,7 +643,7 @@ class GitService:
                     current_file["status"] = "deleted"
 
             # File rename detection
-            elif line.startswith("similarity index") or line.startswith("rename from"):
+            elif line.startswith(("similarity index", "rename from")):
                 if current_file:
                     current_file["is_renamed"] = True
                     current_file["status"] = "renamed"
@@ -463,75 +654,19 @@ class GitService:
                     current_file["chunks"].append(self._finalize_chunk(current_chunk))
 
                 # Parse chunk header: @@ -old_start,old_lines +new_start,new_lines @@
-                match = re.match(r"@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@", line)
+                match = HUNK_HEADER_RE.match(line)
                 if match:
+                    cur_old = int(match.group(1))
+                    cur_new = int(match.group(3))
+                    cur_lines = []
                     current_chunk = {
-                        "old_start": int(match.group(1)),
+                        "old_start": cur_old,
                         "old_lines": int(match.group(2) or 1),
-                        "new_start": int(match.group(3)),
+                        "new_start": cur_new,
                         "new_lines": int(match.group(4) or 1),
-                        "lines": [],
+                        "lines": cur_lines,
                     }
 
-            # Diff lines
-            elif current_chunk is not None and (
-                line.startswith(" ") or line.startswith("-") or line.startswith("+")
-            ):
-                if line.startswith(" "):
-                    # Context line
-                    old_num = current_chunk.get(
-                        "current_old", current_chunk["old_start"]
-                    )
-                    new_num = current_chunk.get(
-                        "current_new", current_chunk["new_start"]
-                    )
-                    current_chunk["lines"].append(
-                        {
-                            "type": LineType.CONTEXT,
-                            "oldNum": old_num,
-                            "newNum": new_num,
-                            "content": line[1:],  # Remove prefix
-                        }
-                    )
-                    current_chunk["current_old"] = old_num + 1
-                    current_chunk["current_new"] = new_num + 1
-
-                elif line.startswith("-"):
-                    # Deletion
-                    old_num = current_chunk.get(
-                        "current_old", current_chunk["old_start"]
-                    )
-                    current_chunk["lines"].append(
-                        {
-                            "type": LineType.DELETION,
-                            "oldNum": old_num,
-                            "newNum": None,
-                            "content": line[1:],  # Remove prefix
-                        }
-                    )
-                    current_chunk["current_old"] = old_num + 1
-                    if current_file:
-                        current_file["deletions"] += 1
-
-                elif line.startswith("+"):
-                    # Addition
-                    new_num = current_chunk.get(
-                        "current_new", current_chunk["new_start"]
-                    )
-                    current_chunk["lines"].append(
-                        {
-                            "type": LineType.ADDITION,
-                            "oldNum": None,
-                            "newNum": new_num,
-                            "content": line[1:],  # Remove prefix
-                        }
-                    )
-                    current_chunk["current_new"] = new_num + 1
-                    if current_file:
-                        current_file["additions"] += 1
-
-            i += 1
-
         # Finalize last file and chunk
         if current_chunk and current_file:
             current_file["chunks"].append(self._finalize_chunk(current_chunk))
@@ -550,15 +685,14 @@ class GitService:
         return files
 
     def _finalize_chunk(self, chunk_data: Dict[str, Any]) -> DiffChunk:
-        """Convert chunk dict to DiffChunk model."""
-        lines = [DiffLine(**line_data) for line_data in chunk_data["lines"]]
-        return DiffChunk(
-            old_start=chunk_data["old_start"],
-            old_lines=chunk_data["old_lines"],
-            new_start=chunk_data["new_start"],
-            new_lines=chunk_data["new_lines"],
-            lines=lines,
-        )
+        """Convert chunk dict to DiffChunk model.
+
+        The whole chunk, line dicts included, is validated in one call, which
+        keeps the per-line work inside pydantic-core. This is faster than
+        building each DiffLine separately, and faster than model_construct,
+        which runs in Python.
+        """
+        return DiffChunk.model_validate(chunk_data)
 
     def _finalize_file(self, file_data: Dict[str, Any]) -> DiffFile:
         """Convert file dict to DiffFile model."""
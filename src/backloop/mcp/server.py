@@ -1,20 +1,18 @@
 import argparse
 import asyncio
-import threading
-from typing import Union
+import contextlib
+import socket
+from typing import Iterator, List, Optional, Union
 from pathlib import Path
 
 import uvicorn
 from mcp.server.fastmcp import FastMCP
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 
+from backloop.config import settings
 from backloop.models import Comment, ReviewApproved, CommentStatus
 from backloop.event_manager import EventManager, EventType
 from backloop.services.review_service import ReviewService
 from backloop.services.mcp_service import McpService
-from backloop.api.review_router import create_review_router
 from backloop.file_watcher import FileWatcher
 from backloop.utils.common import get_random_port, debug_write, get_base_directory
 
@@ -90,7 +88,42 @@ review_service: ReviewService | None = None
 mcp_service: McpService | None = None
 file_watcher: FileWatcher | None = None
 web_server_port: int | None = None
-web_server_thread: threading.Thread | None = None
+web_server: "EmbeddedServer | None" = None
+web_server_task: asyncio.Task | None = None
+# Held while the web server starts, so concurrent reviews share one server
+web_server_lock = asyncio.Lock()
+
+STATIC_DIR = Path(__file__).parent.parent / "static"
+
+WEB_SERVER_STARTUP_TIMEOUT = 5.0
+
+
+class EmbeddedServer(uvicorn.Server):
+    """A uvicorn server sharing the MCP server's event loop.
+
+    It signals an asyncio.Event once it is listening and leaves signal
+    handling to the MCP server that owns the process.
+    """
+
+    def __init__(self, config: uvicorn.Config) -> None:
+        super().__init__(config)
+        self.ready = asyncio.Event()
+
+    @contextlib.contextmanager
+    def capture_signals(self) -> Iterator[None]:
+        yield
+
+    async def serve(self, sockets: Optional[List[socket.socket]] = None) -> None:
+        try:
+            await super().serve(sockets=sockets)
+        except SystemExit as e:
+            # uvicorn exits the process when startup fails; on the shared
+            # loop that would take the MCP server down with it.
+            debug_write("[ERROR] Web server exited with status %s", e.code)
+
+    async def startup(self, sockets: Optional[List[socket.socket]] = None) -> None:
+        await super().startup(sockets=sockets)
+        self.ready.set()
 
 
 def get_services() -> tuple[ReviewService, McpService, EventManager]:
@@ -98,7 +131,7 @@ def get_services() -> tuple[ReviewService, McpService, EventManager]:
     global event_manager, review_service, mcp_service, file_watcher
     if event_manager is None:
         base_dir = get_base_directory()
-        debug_write(f"[DEBUG] Initializing MCP services for directory: {base_dir}")
+        debug_write("[DEBUG] Initializing MCP services for directory: %s", base_dir)
         loop = asyncio.get_running_loop()
         event_manager = EventManager()
         review_service = ReviewService(event_manager)
@@ -111,24 +144,42 @@ def get_services() -> tuple[ReviewService, McpService, EventManager]:
         # Start the review service's event listener
         review_service.start_event_listener()
 
-        debug_write(f"[DEBUG] MCP services initialization complete")
+        debug_write("[DEBUG] MCP services initialization complete")
     assert review_service is not None
     assert mcp_service is not None
     return review_service, mcp_service, event_manager
 
 
-def start_web_server() -> int:
-    """Start the web server in a background thread if not already running."""
-    global web_server_port, web_server_thread
+async def start_web_server() -> int:
+    """Start the web server on the running event loop if not already running.
+
+    Raises:
+        RuntimeError: If the server does not start.
+    """
+    async with web_server_lock:
+        if web_server_port is not None:
+            debug_write("[DEBUG] Web server already running on port %s", web_server_port)
+            return web_server_port
+        return await _start_web_server()
 
-    if web_server_port is not None:
-        debug_write(f"[DEBUG] Web server already running on port {web_server_port}")
-        return web_server_port
+
+async def _start_web_server() -> int:
+    """Start the web server and record it once it accepts connections."""
+    global web_server_port, web_server, web_server_task
 
     debug_write("[DEBUG] Starting web server...")
 
     review_svc, mcp_svc, event_mgr = get_services()
 
+    # The web stack is only needed once a review is started, so keep it out
+    # of the MCP server's startup
+    from fastapi import FastAPI
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.middleware.gzip import GZipMiddleware
+    from fastapi.staticfiles import StaticFiles
+
+    from backloop.api.review_router import create_review_router
+
     # Create FastAPI app
     app = FastAPI(title="Git Diff Viewer", version="0.1.0")
 
@@ -140,7 +191,9 @@ def start_web_server() -> int:
         allow_headers=["*"],
     )
 
-    STATIC_DIR = Path(__file__).parent.parent / "static"
+    if settings.compress_responses:
+        app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=4)
+
     app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 
     # Store services in app state
@@ -151,44 +204,66 @@ def start_web_server() -> int:
     # Include the review router
     app.include_router(create_review_router())
 
-    # Get random port
-    sock, port = get_random_port()
-    sock.close()  # Close socket, uvicorn will reopen it
-    web_server_port = port
+    # Get random port; uvicorn serves on this socket directly, so the port
+    # cannot be taken between picking it and binding it
+    sock, port = get_random_port("127.0.0.1")
 
-    debug_write(f"[DEBUG] Got port {port}, starting uvicorn in background thread")
+    debug_write("[DEBUG] Got port %s, starting uvicorn", port)
 
-    # Start server in background thread
-    def run_server() -> None:
-        try:
-            debug_write(f"[DEBUG] Background thread starting uvicorn on port {port}")
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            uvicorn.run(app, host="127.0.0.1", port=port, log_level="error")
-        except Exception as e:
-            debug_write(f"[ERROR] Failed to start uvicorn: {e}")
+    # Nobody reads the embedded server's access log, so skip building it
+    config = uvicorn.Config(
+        app,
+        host="127.0.0.1",
+        port=port,
+        log_level="error",
+        access_log=False,
+        http="httptools",
+    )
+    server = EmbeddedServer(config)
+
+    # Serve on the MCP server's own loop: the services, the file watcher and
+    # the web handlers then share one loop, and nothing has to cross threads.
+    task = asyncio.create_task(server.serve(sockets=[sock]))
+
+    def on_server_exit(task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            debug_write("[ERROR] Failed to start uvicorn: %s", task.exception())
+        # Never leave start_web_server waiting on a server that died
+        server.ready.set()
+
+    task.add_done_callback(on_server_exit)
+
+    # Hand out the review URL only once the server accepts connections
+    try:
+        await asyncio.wait_for(server.ready.wait(), timeout=WEB_SERVER_STARTUP_TIMEOUT)
+    except asyncio.TimeoutError:
+        debug_write("[ERROR] Web server did not start within %ss", WEB_SERVER_STARTUP_TIMEOUT)
 
-    web_server_thread = threading.Thread(target=run_server, daemon=True)
-    web_server_thread.start()
+    if not server.started or task.done():
+        task.cancel()
+        sock.close()
+        raise RuntimeError("Could not start the review web server")
 
-    debug_write(f"[DEBUG] Web server thread started on port {port}")
+    web_server_port, web_server, web_server_task = port, server, task
+    debug_write("[DEBUG] Web server started on port %s", port)
 
     return port
 
 
-def startreview(
+async def startreview(
     commit: str | None = None, range: str | None = None, since: str | None = None, title: str | None = None
 ) -> str:
     # Get services
     review_svc, mcp_svc, event_mgr = get_services()
 
-    # Create a new review session
-    review_session = review_svc.create_review_session(
+    # Create a new review session; its diff is computed off the event loop
+    # the web server and MCP stdio share
+    review_session = await review_svc.create_review_session_in_thread(
         commit=commit, range=range, since=since, title=title
     )
 
     # Start web server if not already running and get URL
-    port = start_web_server()
+    port = await start_web_server()
     review_url = f"http://127.0.0.1:{port}/review/{review_session.id}"
 
     return f"""Review session started at {review_url}."""
@@ -198,89 +273,92 @@ async def await_comments() -> Union[dict, str]:
     review_svc, mcp_svc, event_mgr = get_services()
     result = await mcp_svc.await_comments()
 
-    if isinstance(result, ReviewApproved):
-        return "REVIEW APPROVED"
-    elif isinstance(result, Comment):
-        # Return comment with file name, line number, and review context
-        response: dict = {
-            "review_id": result.review_id,
-            "id": result.id,
-            "file_path": result.file_path,
-            "line_number": result.line_number,
-            "side": result.side,
-            "content": result.content,
-            "author": result.author,
-        }
-
-        # If this is a reply, include the thread context so the agent
-        # can understand what the user is responding to
-        if result.in_reply_to and result.review_id:
-            for review_session in review_svc.active_reviews.values():
-                parent = review_session.comment_service.get_comment(result.in_reply_to)
-                if parent:
+    match result:
+        case ReviewApproved():
+            return "REVIEW APPROVED"
+        case Comment():
+            # Return comment with file name, line number, and review context
+            response: dict = {
+                "review_id": result.review_id,
+                "id": result.id,
+                "file_path": result.file_path,
+                "line_number": result.line_number,
+                "side": result.side,
+                "content": result.content,
+                "author": result.author,
+            }
+
+            # If this is a reply, include the thread context so the agent
+            # can understand what the user is responding to
+            if result.in_reply_to and result.review_id:
+                parent_session = review_svc.find_comment_session(result.in_reply_to)
+                if parent_session:
+                    parent = parent_session.comment_service.get_comment(result.in_reply_to)
+                    assert parent is not None
                     response["thread_context"] = {
                         "original_comment": parent.content,
                         "resolution_note": parent.reply_message,
                     }
-                    break
 
-        return response
-    else:
-        # This shouldn't happen but handle it gracefully
-        return "UNKNOWN RESULT"
+            return response
+        case _:
+            # This shouldn't happen but handle it gracefully
+            return "UNKNOWN RESULT"
 
 
 async def resolve_comment(comment_id: str) -> str:
     review_svc, mcp_svc, event_mgr = get_services()
 
-    for review_session in review_svc.active_reviews.values():
-        comment = review_session.comment_service.get_comment(comment_id)
-        if comment:
-            review_session.comment_service.update_comment_status(
-                comment_id, CommentStatus.RESOLVED
-            )
-            await event_mgr.emit_event(
-                EventType.COMMENT_RESOLVED,
-                {
-                    "comment_id": comment_id,
-                    "file_path": comment.file_path,
-                    "line_number": comment.line_number,
-                    "status": CommentStatus.RESOLVED.value,
-                    "reply_message": None,
-                },
-                review_id=review_session.id,
-            )
-            return "Comment resolved."
-
-    return f"Comment {comment_id} not found in any active review session."
+    review_session = review_svc.find_comment_session(comment_id)
+    if review_session is None:
+        return f"Comment {comment_id} not found in any active review session."
+
+    comment = review_session.comment_service.get_comment(comment_id)
+    assert comment is not None
+    review_session.comment_service.update_comment_status(
+        comment_id, CommentStatus.RESOLVED
+    )
+    await event_mgr.emit_event(
+        EventType.COMMENT_RESOLVED,
+        {
+            "comment_id": comment_id,
+            "file_path": comment.file_path,
+            "line_number": comment.line_number,
+            "status": CommentStatus.RESOLVED.value,
+            "reply_message": None,
+        },
+        review_id=review_session.id,
+    )
+    return "Comment resolved."
 
 
 async def respond_comment(comment_id: str, message: str) -> str:
     review_svc, mcp_svc, event_mgr = get_services()
 
-    for review_session in review_svc.active_reviews.values():
-        comment = review_session.comment_service.get_comment(comment_id)
-        if comment:
-            # Set reply_message and mark as resolved.
-            comment.reply_message = message
-            review_session.comment_service.update_comment_status(
-                comment_id, CommentStatus.RESOLVED
-            )
-
-            await event_mgr.emit_event(
-                EventType.COMMENT_REPLIED,
-                {
-                    "comment_id": comment_id,
-                    "file_path": comment.file_path,
-                    "line_number": comment.line_number,
-                    "status": CommentStatus.RESOLVED.value,
-                    "reply_message": message,
-                },
-                review_id=review_session.id,
-            )
-            return "Reply sent."
-
-    return f"Comment {comment_id} not found in any active review session."
+    review_session = review_svc.find_comment_session(comment_id)
+    if review_session is None:
+        return f"Comment {comment_id} not found in any active review session."
+
+    comment = review_session.comment_service.get_comment(comment_id)
+    assert comment is not None
+    # Set reply_message and mark as resolved.
+    comment.reply_message = message
+    review_session.comment_service.update_comment_status(
+        comment_id, CommentStatus.RESOLVED
+    )
+
+    await event_mgr.emit_event(
+        EventType.COMMENT_REPLIED,
+        {
+            "comment_id": comment_id,
+            "file_path": comment.file_path,
+            "line_number": comment.line_number,
+            "status": CommentStatus.RESOLVED.value,
+            "reply_message": message,
+        },
+        review_id=review_session.id,
+    )
+    return "Reply sent."
 
 
 def main() -> None:
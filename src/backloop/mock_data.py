@@ -1,8 +1,11 @@
 """Mock data for testing and demonstration purposes."""
 
+from functools import cache
+
 from backloop.models import GitDiff, DiffFile, DiffChunk, DiffLine, LineType
 
 
+@cache
 def get_mock_diff() -> GitDiff:
     """Get mock diff data for testing and demonstration purposes."""
 
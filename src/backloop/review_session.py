@@ -1,3 +1,5 @@
+import asyncio
+import hashlib
 import uuid
 import time
 
@@ -34,16 +36,41 @@ class ReviewSession:
 
         self.is_live = since is not None or (commit is None and range is None)
         self.view_params = self._build_view_params()
+        self.view_url = f"/review/{self.id}/view?{self.view_params}"
 
         self.git_service = GitService()
-        comment_file = get_state_dir() / f"backloop_comments_{self.id}.json"
+        comment_file = get_state_dir() / f"backloop_comments_{self.id}.jsonl"
         self.comment_service = CommentService(
             storage_path=str(comment_file),
             default_review_id=self.id,
         )
 
+        self._diff_json: bytes | None = None
+        self._diff_etag: str | None = None
         self.diff = self._get_diff()
 
+    @property
+    def diff(self) -> GitDiff:
+        """The session's current diff."""
+        return self._diff
+
+    @diff.setter
+    def diff(self, value: GitDiff) -> None:
+        self._diff = value
+        self._diff_json = None
+        self._diff_etag = None
+
+    def diff_json(self) -> tuple[bytes, str]:
+        """Return the diff serialized as JSON along with its ETag.
+
+        The encoding is cached until the diff is replaced, so repeated
+        requests for an unchanged diff skip serialization entirely.
+        """
+        if self._diff_json is None or self._diff_etag is None:
+            self._diff_json = self._diff.model_dump_json(by_alias=True).encode("utf-8")
+            self._diff_etag = f'"{hashlib.blake2b(self._diff_json, digest_size=8).hexdigest()}"'
+        return self._diff_json, self._diff_etag
+
     def _build_view_params(self) -> str:
         """Build query parameters for the view redirect."""
         params = []
@@ -83,3 +110,11 @@ class ReviewSession:
     def refresh_diff(self) -> None:
         """Recalculate the diff data for the session."""
         self.diff = self._get_diff()
+
+    async def refresh_diff_in_thread(self) -> None:
+        """Recalculate the diff without blocking the event loop.
+
+        Only git and the parse run in a worker thread; the diff is replaced
+        back on the loop.
+        """
+        self.diff = await asyncio.to_thread(self._get_diff)
@@ -7,19 +7,24 @@ from typing import AsyncIterator
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
 
+from backloop.config import settings
 from backloop.utils.common import get_random_port, debug_write, get_base_directory
 from backloop.services.review_service import ReviewService
 from backloop.services.mcp_service import McpService
 from backloop.api.review_router import create_review_router
 from backloop.event_manager import EventManager
-from backloop.file_watcher import FileWatcher
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     """Manage the application's lifespan."""
+    # Only needed once the server starts, so importing the CLI (e.g. for
+    # --help) does not pay for the watcher and its native extension.
+    from backloop.file_watcher import FileWatcher
+
     loop = asyncio.get_running_loop()
 
     # Initialize services
@@ -29,10 +34,10 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
 
     # Initialize file watcher
     base_dir = get_base_directory()
-    debug_write(f"[DEBUG] Initializing file watcher for directory: {base_dir}")
+    debug_write("[DEBUG] Initializing file watcher for directory: %s", base_dir)
     file_watcher = FileWatcher(event_manager, loop)
     file_watcher.start_watching(str(base_dir))
-    debug_write(f"[DEBUG] File watcher initialization complete")
+    debug_write("[DEBUG] File watcher initialization complete")
 
     # Start the review service's event listener
     review_service.start_event_listener()
@@ -63,6 +68,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.compress_responses:
+    app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=4)
+
 STATIC_DIR = Path(__file__).parent / "static"
 app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 
@@ -80,10 +88,10 @@ def main() -> None:
     if not port:
         sock, port = get_random_port()
         print(f"Review server available at: http://127.0.0.1:{port}")
-        uvicorn.run(app, fd=sock.fileno())
+        uvicorn.run(app, fd=sock.fileno(), loop="auto", http="httptools")
     else:
         print(f"Review server available at: http://127.0.0.1:{port}")
-        uvicorn.run(app, host="127.0.0.1", port=port)
+        uvicorn.run(app, host="127.0.0.1", port=port, loop="auto", http="httptools")
 
 
 if __name__ == "__main__":
@@ -1,13 +1,27 @@
 import asyncio
-from typing import Dict, Union
+from collections import deque
+from typing import Callable, Dict, Set, Union
 from datetime import datetime
 
 from backloop.models import Comment, ReviewApproved, CommentStatus
 from backloop.config import settings
+from backloop.utils.common import debug_write
 from backloop.event_manager import EventManager, EventType
 from backloop.services.review_service import ReviewService
 
 
+class CommentQueueFullError(Exception):
+    """Raised when the pending comment queue is at capacity."""
+
+
+def _running_loop() -> asyncio.AbstractEventLoop | None:
+    """Return the event loop running in this thread, if any."""
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
 class McpService:
     """Manages MCP server interactions, like comment queuing and approvals."""
 
@@ -16,70 +30,103 @@ class McpService:
         self._review_service = review_service
         self._event_manager = event_manager
         self._event_loop = loop
-        self._pending_comments: asyncio.Queue[Comment] = asyncio.Queue()
+        # deque.append/popleft are atomic, so producers on other threads can
+        # push directly and only the wakeup has to go through the loop.
+        self._pending_comments: deque[Comment] = deque()
         self._review_approved: Dict[str, bool] = {}
+        # Set whenever a comment is queued or a review is approved, so that
+        # await_comments() sleeps until there is something to look at.
+        self._wakeup = asyncio.Event()
+        self._background_tasks: Set[asyncio.Task] = set()
+        # Nothing drains the queue until an agent awaits comments (and the
+        # standalone server never does), so only then is its size limited.
+        self._has_consumer = False
 
     @property
     def review_approved(self) -> Dict[str, bool]:
         """Expose review approval state for coordination with other services."""
         return self._review_approved
 
+    def has_queue_capacity(self) -> bool:
+        """Check whether another comment can be queued for the MCP server."""
+        if not self._has_consumer:
+            return True
+        return len(self._pending_comments) < settings.max_pending_comments
+
     def add_comment_to_queue(self, comment: Comment) -> None:
-        """Add a comment to the pending queue for the MCP server."""
-        if settings.debug:
-            print(f"[DEBUG] Adding comment to MCP queue: {comment.id}")
+        """Add a comment to the pending queue for the MCP server.
 
-        def enqueue() -> None:
-            self._pending_comments.put_nowait(comment)
+        Raises:
+            CommentQueueFullError: If the agent has fallen too far behind.
+        """
+        if not self.has_queue_capacity():
+            raise CommentQueueFullError(f"{len(self._pending_comments)} comments already pending")
+        debug_write("[DEBUG] Adding comment to MCP queue: %s", comment.id)
+        self._pending_comments.append(comment)
+        self._call_in_loop(self._wakeup.set)
 
-        if self._event_loop:
-            self._event_loop.call_soon_threadsafe(enqueue)
-        else:
-            enqueue()
+    def discard_comment(self, comment_id: str) -> None:
+        """Drop a comment from the pending queue, e.g. because it was deleted."""
+
+        def discard() -> None:
+            for index, comment in enumerate(self._pending_comments):
+                if comment.id == comment_id:
+                    del self._pending_comments[index]
+                    return
+
+        # Scanning the deque is only safe where nothing appends to it meanwhile
+        self._call_in_loop(discard)
 
     def approve_review(self, review_id: str) -> None:
         """Mark a review as approved."""
-        if settings.debug:
-            print(f"[DEBUG] Marking review {review_id} as approved in MCP service")
+        debug_write("[DEBUG] Marking review %s as approved in MCP service", review_id)
         self._review_approved[review_id] = True
+        self._call_in_loop(self._wakeup.set)
+
+    def _call_in_loop(self, callback: Callable[[], None]) -> None:
+        """Run a callback on the service's event loop, which may belong to another thread."""
+        if self._event_loop is None or self._event_loop is _running_loop():
+            callback()
+        else:
+            self._event_loop.call_soon_threadsafe(callback)
 
     async def await_comments(self) -> Union[Comment, ReviewApproved]:
         """Wait for a comment to be posted or for a review to be approved."""
-        if settings.debug:
-            print("[DEBUG] MCP service awaiting comments...")
+        debug_write("[DEBUG] MCP service awaiting comments...")
+        self._has_consumer = True
 
         current_review = self._review_service.get_most_recent_review()
         current_review_id = current_review.id if current_review else None
 
         while True:
-            # Check if any approved review has no pending comments
-            if not self._pending_comments.empty():
+            if self._pending_comments:
                 # Prioritize draining the queue
-                pass
-            else:
-                # Only return approved if it matches the current review
-                if current_review_id and self._review_approved.get(current_review_id):
-                    # Clear the approval flag
-                    del self._review_approved[current_review_id]
-                    return ReviewApproved(review_id=current_review_id, timestamp=datetime.now().isoformat())
-
-            try:
-                comment = await asyncio.wait_for(self._pending_comments.get(), timeout=1.0)
-                if settings.debug:
-                    print(f"[DEBUG] Dequeued comment {comment.id} for processing")
+                comment = self._pending_comments.popleft()
+                debug_write("[DEBUG] Dequeued comment %s for processing", comment.id)
 
                 review_session = self._review_service.get_review_session(comment.review_id)
                 if review_session:
                     review_session.comment_service.update_comment_status(
                         comment.id, CommentStatus.IN_PROGRESS
                     )
-                    # This might be redundant if the agent resolves it, but good for UI
-                    await self._event_manager.emit_event(
-                        EventType.COMMENT_DEQUEUED,
-                        {"comment_id": comment.id, "status": CommentStatus.IN_PROGRESS.value},
-                        review_id=comment.review_id,
+                    # This might be redundant if the agent resolves it, but good for UI.
+                    # Fan-out runs in the background so the comment is returned at once.
+                    task = asyncio.create_task(
+                        self._event_manager.emit_event(
+                            EventType.COMMENT_DEQUEUED,
+                            {"comment_id": comment.id, "status": CommentStatus.IN_PROGRESS.value},
+                            review_id=comment.review_id,
+                        )
                     )
+                    # Keep a reference so the task is not garbage collected mid-flight
+                    self._background_tasks.add(task)
+                    task.add_done_callback(self._background_tasks.discard)
                 return comment
 
-            except asyncio.TimeoutError:
-                continue
+            # Only return approved if it matches the current review; popping
+            # checks and clears the approval flag in one lookup
+            if current_review_id and self._review_approved.pop(current_review_id, False):
+                return ReviewApproved(review_id=current_review_id, timestamp=datetime.now().isoformat())
+
+            self._wakeup.clear()
+            await self._wakeup.wait()
@@ -11,6 +11,8 @@ class ReviewService:
     def __init__(self, event_manager: EventManager) -> None:
         """Initialize the review service."""
         self.active_reviews: Dict[str, ReviewSession] = {}
+        self._comment_sessions: Dict[str, ReviewSession] = {}
+        self._most_recent_review: ReviewSession | None = None
         self._event_manager = event_manager
         self._event_listener_task: asyncio.Task | None = None
 
@@ -22,8 +24,31 @@ class ReviewService:
         title: str | None = None,
     ) -> ReviewSession:
         """Create a new review session and store it."""
-        review_session = ReviewSession(commit=commit, range=range, since=since, title=title)
+        return self._add_review_session(
+            ReviewSession(commit=commit, range=range, since=since, title=title)
+        )
+
+    async def create_review_session_in_thread(
+        self,
+        commit: str | None = None,
+        range: str | None = None,
+        since: str | None = None,
+        title: str | None = None,
+    ) -> ReviewSession:
+        """Create and store a new review session without blocking the event loop.
+
+        The session, including its initial diff, is built in a worker thread
+        and stored back on the loop.
+        """
+        review_session = await asyncio.to_thread(
+            ReviewSession, commit=commit, range=range, since=since, title=title
+        )
+        return self._add_review_session(review_session)
+
+    def _add_review_session(self, review_session: ReviewSession) -> ReviewSession:
+        """Store a review session and make it the most recent one."""
         self.active_reviews[review_session.id] = review_session
+        self._most_recent_review = review_session
         return review_session
 
     def get_review_session(self, review_id: str) -> ReviewSession | None:
@@ -32,36 +57,76 @@ class ReviewService:
 
     def get_most_recent_review(self) -> ReviewSession | None:
         """Get the most recently created review session."""
-        if not self.active_reviews:
-            return None
-        return max(self.active_reviews.values(), key=lambda r: r.created_at)
+        return self._most_recent_review
 
     def remove_review_session(self, review_id: str) -> bool:
         """Remove a review session."""
         if review_id in self.active_reviews:
-            del self.active_reviews[review_id]
+            review_session = self.active_reviews.pop(review_id)
+            self._comment_sessions = {
+                comment_id: session
+                for comment_id, session in self._comment_sessions.items()
+                if session is not review_session
+            }
+            if review_session is self._most_recent_review:
+                self._most_recent_review = (
+                    max(self.active_reviews.values(), key=lambda r: r.created_at)
+                    if self.active_reviews
+                    else None
+                )
             return True
         return False
 
+    def register_comment(self, comment_id: str, review_session: ReviewSession) -> None:
+        """Record which review session a comment belongs to."""
+        self._comment_sessions[comment_id] = review_session
+
+    def forget_comment(self, comment_id: str) -> None:
+        """Drop a deleted comment from the comment index."""
+        self._comment_sessions.pop(comment_id, None)
+
+    def find_comment_session(self, comment_id: str) -> ReviewSession | None:
+        """Find the review session that owns a comment."""
+        review_session = self._comment_sessions.get(comment_id)
+        if review_session is not None and review_session.comment_service.get_comment(comment_id):
+            return review_session
+
+        # Comments added directly through a session's CommentService are not
+        # registered, so fall back to a scan and index the result.
+        for review_session in self.active_reviews.values():
+            if review_session.comment_service.get_comment(comment_id):
+                self._comment_sessions[comment_id] = review_session
+                return review_session
+        return None
+
     async def _event_listener(self) -> None:
         """Listen for events and update review sessions accordingly."""
         subscriber = await self._event_manager.subscribe()
         try:
             while True:
-                events = await self._event_manager.wait_for_events(subscriber)
-                for event in events:
-                    # Only process global events (review_id=None) to avoid re-processing our own emitted events
-                    if event.type == EventType.FILE_CHANGED and event.review_id is None:
-                        for review in self.active_reviews.values():
-                            if review.is_live:
-                                review.refresh_diff()
-                            # Forward file changed events to ALL reviews (not just live)
-                            # so the frontend can update the view for any review type
-                            await self._event_manager.emit_event(
-                                EventType.FILE_CHANGED,
-                                event.data,
-                                review_id=review.id,
-                            )
+                events = await self._event_manager.wait_for_events(subscriber, timeout=None)
+                # Only process global events (review_id=None) to avoid re-processing our own emitted events
+                changes = [
+                    event for event in events
+                    if event.type == EventType.FILE_CHANGED and event.review_id is None
+                ]
+                if not changes:
+                    continue
+                # Copied, since sessions may be added while a diff is refreshed
+                for review in list(self.active_reviews.values()):
+                    # A burst of changes arrives as one batch, so the diff is
+                    # recomputed once for all of them. The web server shares
+                    # this loop, so git runs in a worker thread.
+                    if review.is_live:
+                        await review.refresh_diff_in_thread()
+                    # Forward file changed events to ALL reviews (not just live)
+                    # so the frontend can update the view for any review type
+                    for event in changes:
+                        await self._event_manager.emit_event(
+                            EventType.FILE_CHANGED,
+                            event.data,
+                            review_id=review.id,
+                        )
         finally:
             await self._event_manager.unsubscribe(subscriber.id)
 
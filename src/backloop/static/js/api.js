@@ -97,6 +97,7 @@ export async function fetchDiff(params = {}) {
     if (params.range) queryParams.set('range', params.range);
     if (params.live) queryParams.set('live', params.live);
     if (params.since) queryParams.set('since', params.since);
+    if (params.mock) queryParams.set('mock', 'true');
 
     const queryString = queryParams.toString();
     const endpoint = `/review/${reviewId}/api/diff${queryString ? `?${queryString}` : ''}`;
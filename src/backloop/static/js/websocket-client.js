@@ -43,7 +43,8 @@ function connectWebSocket() {
             try {
                 const data = JSON.parse(event.data);
                 console.log('WebSocket message received:', data);
-                handleEvent(data);
+                // The server batches events into a single frame
+                data.events.forEach(handleEvent);
             } catch (error) {
                 console.error('Error parsing WebSocket message:', error);
             }
@@ -1,26 +1,34 @@
-import os
 import socket
 import subprocess
+from functools import lru_cache
 from pathlib import Path
 from typing import Tuple
 
+from backloop.config import settings
 
-def debug_write(message: str) -> None:
-    """Write debug message to /tmp/backloop-debug.txt if BACKLOOP_DEBUG is set."""
-    if not os.environ.get("BACKLOOP_DEBUG"):
+
+def debug_write(message: str, *args: object) -> None:
+    """Write debug message to /tmp/backloop-debug.txt if BACKLOOP_DEBUG is set.
+
+    Any args are %-formatted into the message only when debugging is enabled,
+    so hot paths do not pay for building messages that are thrown away.
+    """
+    if not settings.debug:
         return
+    if args:
+        message = message % args
     with open("/tmp/backloop-debug.txt", "a") as f:
         f.write(f"{message}\n")
 
 
-def get_random_port() -> Tuple[socket.socket, int]:
+def get_random_port(host: str = "") -> Tuple[socket.socket, int]:
     """Get a random available port and return the socket and port number.
 
     Returns the socket to avoid timing issues where the port might be taken
     between checking and using it. The caller should close the socket when done.
     """
     sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    sock.bind(("", 0))
+    sock.bind((host, 0))
     sock.listen(1)
     port = sock.getsockname()[1]
     return sock, port
@@ -38,10 +46,16 @@ def get_base_directory() -> Path:
     Raises:
         RuntimeError: If not in a git repository or git is not found.
     """
+    return _git_toplevel(Path.cwd())
+
+
+@lru_cache(maxsize=16)
+def _git_toplevel(cwd: Path) -> Path:
+    """Look up the repository root for a directory, once per directory."""
     try:
         result = subprocess.run(
             ["git", "rev-parse", "--show-toplevel"],
-            cwd=Path.cwd(),
+            cwd=cwd,
             capture_output=True,
             text=True,
             check=True,
@@ -0,0 +1,190 @@
+"""In-process application of unified diff patches."""
+
+import os
+import re
+import shutil
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List
+
+HUNK_HEADER_RE = re.compile(rb"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+class PatchError(Exception):
+    """Raised when a patch is malformed or does not match the target file."""
+
+
+class MalformedPatchError(PatchError):
+    """Raised when a patch cannot be parsed."""
+
+
+@dataclass(slots=True)
+class Hunk:
+    """A single hunk of a unified diff, with line endings preserved."""
+
+    old_start: int
+    old_count: int
+    new_start: int
+    new_count: int
+    old_lines: List[bytes] = field(default_factory=list)
+    new_lines: List[bytes] = field(default_factory=list)
+
+
+def split_lines(data: bytes) -> List[bytes]:
+    """Split data on newlines only, keeping the line endings."""
+    lines = data.split(b"\n")
+    tail = lines.pop()
+    result = [line + b"\n" for line in lines]
+    if tail:
+        result.append(tail)
+    return result
+
+
+def parse_hunks(patch_text: str) -> List[Hunk]:
+    """Parse the hunks of a single-file unified diff.
+
+    File headers and any other lines outside of hunks are ignored. Hunk
+    bodies are consumed according to the line counts in their headers, so
+    content lines that happen to look like headers are handled correctly.
+    """
+    hunks: List[Hunk] = []
+    lines = split_lines(patch_text.encode("utf-8"))
+    i = 0
+
+    while i < len(lines):
+        match = HUNK_HEADER_RE.match(lines[i])
+        i += 1
+        if not match:
+            continue
+
+        hunk = Hunk(
+            old_start=int(match.group(1)),
+            old_count=int(match.group(2) or 1),
+            new_start=int(match.group(3)),
+            new_count=int(match.group(4) or 1),
+        )
+        old_remaining = hunk.old_count
+        new_remaining = hunk.new_count
+        last_targets: List[List[bytes]] = []
+
+        while i < len(lines) and (old_remaining > 0 or new_remaining > 0):
+            line = lines[i]
+            if line.startswith(b"\\"):
+                _strip_last_newline(last_targets)
+                i += 1
+                continue
+
+            if line in (b"\n", b"\r\n"):
+                # Editors commonly strip the space from empty context lines.
+                prefix, content = b" ", line
+            else:
+                prefix, content = line[:1], line[1:]
+
+            if prefix == b" ":
+                last_targets = [hunk.old_lines, hunk.new_lines]
+                old_remaining -= 1
+                new_remaining -= 1
+            elif prefix == b"-":
+                last_targets = [hunk.old_lines]
+                old_remaining -= 1
+            elif prefix == b"+":
+                last_targets = [hunk.new_lines]
+                new_remaining -= 1
+            else:
+                raise MalformedPatchError(f"corrupt patch at line {i + 1}")
+
+            for target in last_targets:
+                target.append(content)
+            i += 1
+
+        if old_remaining != 0 or new_remaining != 0:
+            raise MalformedPatchError(f"corrupt patch: truncated hunk at line {i}")
+
+        # A trailing marker belongs to the final line of the hunk.
+        if i < len(lines) and lines[i].startswith(b"\\"):
+            _strip_last_newline(last_targets)
+            i += 1
+
+        hunks.append(hunk)
+
+    if not hunks:
+        raise MalformedPatchError("No valid hunks found in patch")
+    return hunks
+
+
+def _strip_last_newline(targets: List[List[bytes]]) -> None:
+    """Apply a "No newline at end of file" marker to the preceding line."""
+    for target in targets:
+        if target and target[-1].endswith(b"\n"):
+            target[-1] = target[-1][:-1]
+
+
+def _find_hunk(lines: List[bytes], old_lines: List[bytes], expected: int, lower: int) -> int:
+    """Locate old_lines in lines, preferring the position closest to expected."""
+    size = len(old_lines)
+    upper = len(lines) - size
+    expected = max(lower, min(expected, upper))
+    if not size:
+        # A pure insertion matches anywhere, so take the expected position.
+        return expected
+
+    # Comparing the first line before slicing skips building a candidate
+    # window for almost every position that cannot match.
+    first = old_lines[0]
+    for distance in range(max(expected - lower, upper - expected) + 1):
+        for candidate in (expected - distance, expected + distance):
+            if (
+                lower <= candidate <= upper
+                and lines[candidate] == first
+                and lines[candidate : candidate + size] == old_lines
+            ):
+                return candidate
+    return -1
+
+
+def apply_hunks(content: bytes, hunks: List[Hunk], name: str = "file") -> bytes:
+    """Apply parsed hunks to content and return the patched bytes."""
+    lines = split_lines(content)
+    result: List[bytes] = []
+    cursor = 0
+
+    for hunk in hunks:
+        # Pure insertions are anchored after old_start rather than at it.
+        expected = hunk.old_start if hunk.old_count == 0 else hunk.old_start - 1
+        position = _find_hunk(lines, hunk.old_lines, expected, cursor)
+        if position < 0:
+            raise PatchError(f"patch failed: {name}:{hunk.old_start}")
+
+        result.extend(lines[cursor:position])
+        result.extend(hunk.new_lines)
+        cursor = position + len(hunk.old_lines)
+
+    result.extend(lines[cursor:])
+    return b"".join(result)
+
+
+def apply_unified_diff(path: Path, patch_text: str) -> None:
+    """Apply a single-file unified diff to path in place.
+
+    The file is rewritten atomically, so it is left untouched if any hunk
+    fails to apply.
+
+    Raises:
+        PatchError: If the patch is malformed or does not match the file.
+    """
+    hunks = parse_hunks(patch_text)
+    with open(path, "rb") as f:
+        content = f.read()
+
+    patched = apply_hunks(content, hunks, name=path.name)
+
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(patched)
+        shutil.copymode(path, tmp_name)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
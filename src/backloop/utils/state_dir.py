@@ -1,13 +1,18 @@
 """Utilities for managing application state directory."""
 
 import os
+from functools import lru_cache
 from pathlib import Path
 
 
 def get_state_dir() -> Path:
     """Get the application state directory using XDG_STATE_HOME or fallback to ~/.local/state."""
-    xdg_state_home = os.environ.get("XDG_STATE_HOME")
+    return _ensure_state_dir(os.environ.get("XDG_STATE_HOME"))
 
+
+@lru_cache(maxsize=4)
+def _ensure_state_dir(xdg_state_home: str | None) -> Path:
+    """Create the backloop state directory once per XDG_STATE_HOME value."""
     if xdg_state_home:
         state_dir = Path(xdg_state_home)
     else:
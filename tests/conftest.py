@@ -11,8 +11,15 @@ def pytest_configure(config: pytest.Config) -> None:
     """Configure pytest and apply nest_asyncio for test runs only.
 
     This allows nested event loops so pytest-asyncio can coexist with other runners
-    (like Playwright), but only during tests - not in production code.
+    (like Playwright), but only during tests - not in production code. It is
+    skipped when a uvloop policy is installed, since nest_asyncio can only patch
+    the pure-Python asyncio loop.
     """
+    import asyncio
+
+    if type(asyncio.get_event_loop_policy()).__module__.startswith("uvloop"):
+        return
+
     try:
         import nest_asyncio  # type: ignore[import-untyped]
         nest_asyncio.apply()
@@ -1,13 +1,16 @@
 """Integration tests for review-scoped file endpoints."""
 
+import asyncio
+import subprocess
 from pathlib import Path
-from typing import Tuple
+from typing import Tuple, cast
 
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
 from backloop.api.review_router import create_review_router
+from backloop.config import settings
 from backloop.event_manager import EventManager
 from backloop.models import FileEditRequest
 from backloop.services.mcp_service import McpService
@@ -35,6 +38,18 @@ def review_client(git_repo_with_commits: Path) -> Tuple[TestClient, str, Path]:
     return client, review_session.id, git_repo_with_commits
 
 
+def _deliver_pending_comment(client: TestClient) -> None:
+    """Hand the next queued comment to an agent, as the MCP server would."""
+    app = cast(FastAPI, client.app)
+
+    async def deliver() -> None:
+        await app.state.mcp_service.await_comments()
+        # Let the dequeue notification run before the loop is left behind
+        await asyncio.sleep(0)
+
+    asyncio.run(deliver())
+
+
 class TestReviewFileContent:
     """Tests for retrieving file content within a review."""
 
@@ -71,6 +86,57 @@ class TestReviewFileContent:
 
         assert response.status_code == 400
 
+    def test_get_file_content_binary(self, review_client: Tuple[TestClient, str, Path]) -> None:
+        client, review_id, repo_path = review_client
+        (repo_path / "image.bin").write_bytes(b"\x89PNG\r\n\x1a\n\xff\xfe")
+
+        response = client.get(f"/review/{review_id}/api/file-content?path=image.bin")
+
+        assert response.status_code == 415
+
+    def test_get_file_content_at_ref(self, review_client: Tuple[TestClient, str, Path]) -> None:
+        client, review_id, repo_path = review_client
+        committed = (repo_path / "file1.txt").read_text()
+        (repo_path / "file1.txt").write_text("changed\n")
+
+        response = client.get(f"/review/{review_id}/api/file-content?path=file1.txt&ref=HEAD")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "text/plain; charset=utf-8"
+        assert response.text == committed
+
+    def test_get_file_content_at_ref_not_found(self, review_client: Tuple[TestClient, str, Path]) -> None:
+        client, review_id, _ = review_client
+
+        response = client.get(f"/review/{review_id}/api/file-content?path=missing.txt&ref=HEAD")
+
+        assert response.status_code == 404
+
+    def test_get_file_content_not_modified(self, review_client: Tuple[TestClient, str, Path]) -> None:
+        client, review_id, repo_path = review_client
+        url = f"/review/{review_id}/api/file-content?path=file1.txt"
+
+        etag = client.get(url).headers["etag"]
+        response = client.get(url, headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        (repo_path / "file1.txt").write_text("changed content\n")
+        response = client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.text == "changed content\n"
+
+    def test_get_file_content_at_commit_not_modified(self, review_client: Tuple[TestClient, str, Path]) -> None:
+        client, review_id, repo_path = review_client
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=repo_path, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        url = f"/review/{review_id}/api/file-content?path=file1.txt&ref={commit}"
+
+        etag = client.get(url).headers["etag"]
+        response = client.get(url, headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+
     def test_get_file_content_outside_repo(self, review_client: Tuple[TestClient, str, Path]) -> None:
         client, review_id, _ = review_client
 
@@ -79,6 +145,57 @@ class TestReviewFileContent:
         assert response.status_code == 400
 
 
+class TestReviewDiff:
+    """Tests for retrieving diffs within a review."""
+
+    def test_get_commit_diff_not_modified(self, review_client: Tuple[TestClient, str, Path]) -> None:
+        client, review_id, repo_path = review_client
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=repo_path, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        url = f"/review/{review_id}/api/diff?commit={commit}"
+
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response.json()["files"]
+        response = client.get(url, headers={"If-None-Match": response.headers["etag"]})
+
+        assert response.status_code == 304
+
+    def test_get_symbolic_ref_diff_etag_follows_ref(self, review_client: Tuple[TestClient, str, Path]) -> None:
+        client, review_id, repo_path = review_client
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=repo_path, capture_output=True, text=True, check=True
+        ).stdout.strip()
+
+        by_name = client.get(f"/review/{review_id}/api/diff?commit=HEAD")
+        by_hash = client.get(f"/review/{review_id}/api/diff?commit={commit}")
+
+        assert by_name.headers["etag"] == by_hash.headers["etag"]
+
+    def test_get_range_diff_not_modified(self, review_client: Tuple[TestClient, str, Path]) -> None:
+        client, review_id, _ = review_client
+        url = f"/review/{review_id}/api/diff?range=HEAD~1..HEAD"
+
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response.json()["message"] == "Range: HEAD~1..HEAD"
+        response = client.get(url, headers={"If-None-Match": response.headers["etag"]})
+
+        assert response.status_code == 304
+
+    def test_get_single_ref_range_diff_has_no_etag(self, review_client: Tuple[TestClient, str, Path]) -> None:
+        client, review_id, repo_path = review_client
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=repo_path, capture_output=True, text=True, check=True
+        ).stdout.strip()
+
+        response = client.get(f"/review/{review_id}/api/diff?range={commit}")
+
+        assert response.status_code == 200
+        assert "etag" not in response.headers
+
+
 class TestReviewFileEdit:
     """Tests for editing files via the review API."""
 
@@ -106,6 +223,48 @@ class TestReviewFileEdit:
         assert "edited successfully" in data["message"]
         assert (repo_path / "file1.txt").read_text() == "Line 1 edited\nLine 2\nLine 3\nLine 4\n"
 
+    def test_edit_file_refreshes_live_diff(self, review_client: Tuple[TestClient, str, Path]) -> None:
+        client, review_id, _ = review_client
+        patch = """--- a/file1.txt
++++ b/file1.txt
+@@ -1 +1 @@
+-Line 1 modified
++Line 1 edited
+"""
+        assert client.get(f"/review/{review_id}/api/diff").json()["files"] == []
+
+        request = FileEditRequest(filename="file1.txt", patch=patch)
+        client.post(f"/review/{review_id}/api/edit", json=request.model_dump())
+
+        files = client.get(f"/review/{review_id}/api/diff").json()["files"]
+        assert [f["path"] for f in files] == ["file1.txt"]
+
+    def test_edit_file_resubmitted_patch(self, review_client: Tuple[TestClient, str, Path]) -> None:
+        client, review_id, repo_path = review_client
+        patch = """--- a/file1.txt
++++ b/file1.txt
+@@ -1,4 +1,4 @@
+-Line 1 modified
++Line 1 edited
+ Line 2
+ Line 3
+ Line 4
+"""
+        request = FileEditRequest(filename="file1.txt", patch=patch)
+
+        first = client.post(f"/review/{review_id}/api/edit", json=request.model_dump())
+        second = client.post(f"/review/{review_id}/api/edit", json=request.model_dump())
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert second.json() == first.json()
+        assert (repo_path / "file1.txt").read_text() == "Line 1 edited\nLine 2\nLine 3\nLine 4\n"
+
+        # Once the file changes, the same patch is applied (and conflicts) again.
+        (repo_path / "file1.txt").write_text("Line 1 changed\nLine 2\nLine 3\nLine 4\n")
+        third = client.post(f"/review/{review_id}/api/edit", json=request.model_dump())
+        assert third.status_code == 409
+
     def test_edit_file_absolute_path(self, review_client: Tuple[TestClient, str, Path]) -> None:
         client, review_id, repo_path = review_client
         abs_filename = repo_path / "file1.txt"
@@ -165,6 +324,76 @@ class TestReviewFileEdit:
         assert response.status_code == 409
         assert (repo_path / "file1.txt").read_text() == "Line 1 modified\nLine 2\nLine 3\nLine 4\n"
 
+    def test_edit_file_with_system_patch(
+        self, review_client: Tuple[TestClient, str, Path], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        client, review_id, repo_path = review_client
+        monkeypatch.setattr(settings, "use_system_patch", True)
+        patch = """--- a/file1.txt
++++ b/file1.txt
+@@ -1,4 +1,4 @@
+-Line 1 modified
++Line 1 via git
+ Line 2
+ Line 3
+ Line 4
+"""
+
+        request = FileEditRequest(filename="file1.txt", patch=patch)
+        response = client.post(
+            f"/review/{review_id}/api/edit",
+            json=request.model_dump(),
+        )
+
+        assert response.status_code == 200
+        assert (repo_path / "file1.txt").read_text() == "Line 1 via git\nLine 2\nLine 3\nLine 4\n"
+
+    def test_edit_file_with_system_patch_conflict(
+        self, review_client: Tuple[TestClient, str, Path], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        client, review_id, _ = review_client
+        monkeypatch.setattr(settings, "use_system_patch", True)
+        patch = """--- a/file1.txt
++++ b/file1.txt
+@@ -1 +1 @@
+-No such line
++Replacement
+"""
+
+        request = FileEditRequest(filename="file1.txt", patch=patch)
+        response = client.post(
+            f"/review/{review_id}/api/edit",
+            json=request.model_dump(),
+        )
+
+        assert response.status_code == 409
+        assert response.json()["detail"].startswith("Failed to apply patch: error:")
+
+    def test_edit_file_malformed_hunk(self, review_client: Tuple[TestClient, str, Path]) -> None:
+        client, review_id, repo_path = review_client
+        patch = """--- a/file1.txt
++++ b/file1.txt
+@@ -1,4 +1,4 @@
+-Line 1 modified
+"""
+
+        request = FileEditRequest(filename="file1.txt", patch=patch)
+        response = client.post(
+            f"/review/{review_id}/api/edit",
+            json=request.model_dump(),
+        )
+
+        assert response.status_code == 400
+        assert (repo_path / "file1.txt").read_text() == "Line 1 modified\nLine 2\nLine 3\nLine 4\n"
+
+    def test_edit_file_missing_field(self, review_client: Tuple[TestClient, str, Path]) -> None:
+        client, review_id, _ = review_client
+
+        response = client.post(f"/review/{review_id}/api/edit", json={"filename": "file1.txt"})
+
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"] == ["body", "patch"]
+
     def test_edit_file_outside_repo(self, review_client: Tuple[TestClient, str, Path]) -> None:
         client, review_id, _ = review_client
         patch = """--- a/../outside.txt
@@ -193,6 +422,70 @@ class TestReviewFileEdit:
         assert response.status_code == 400
 
 
+class TestReviewComments:
+    """Tests for posting review comments."""
+
+    def test_create_comment_backlog_full(
+        self, review_client: Tuple[TestClient, str, Path], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        client, review_id, _ = review_client
+        monkeypatch.setattr(settings, "max_pending_comments", 1)
+        comment = {"file_path": "file1.txt", "line_number": 1, "side": "right", "content": "Check"}
+        client.post(f"/review/{review_id}/api/comments", json=comment)
+        _deliver_pending_comment(client)
+
+        first = client.post(f"/review/{review_id}/api/comments", json=comment)
+        second = client.post(f"/review/{review_id}/api/comments", json=comment)
+
+        assert first.status_code == 200
+        assert second.status_code == 429
+        comments = client.get(f"/review/{review_id}/api/comments").json()
+        assert len(comments) == 2
+
+    def test_create_comment_without_agent_is_not_limited(
+        self, review_client: Tuple[TestClient, str, Path], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        client, review_id, _ = review_client
+        monkeypatch.setattr(settings, "max_pending_comments", 1)
+        comment = {"file_path": "file1.txt", "line_number": 1, "side": "right", "content": "Check"}
+
+        for _ in range(3):
+            response = client.post(f"/review/{review_id}/api/comments", json=comment)
+            assert response.status_code == 200
+
+    def test_deleted_comment_leaves_queue(
+        self, review_client: Tuple[TestClient, str, Path], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        client, review_id, _ = review_client
+        monkeypatch.setattr(settings, "max_pending_comments", 1)
+        comment = {"file_path": "file1.txt", "line_number": 1, "side": "right", "content": "Check"}
+        client.post(f"/review/{review_id}/api/comments", json=comment)
+        _deliver_pending_comment(client)
+
+        created = client.post(f"/review/{review_id}/api/comments", json=comment).json()
+        comment_id = created["data"]["comment"]["id"]
+        client.delete(f"/review/{review_id}/api/comments/{comment_id}")
+        response = client.post(f"/review/{review_id}/api/comments", json=comment)
+
+        assert response.status_code == 200
+
+
+class TestReviewWebSocket:
+    """Tests for the review event websocket."""
+
+    def test_websocket_batches_events(self, review_client: Tuple[TestClient, str, Path]) -> None:
+        client, review_id, _ = review_client
+
+        with client.websocket_connect(f"/review/{review_id}/ws") as websocket:
+            response = client.post(f"/review/{review_id}/approve", json={"timestamp": "2024-01-01T00:00:00"})
+            assert response.status_code == 200
+
+            message = websocket.receive_json()
+
+        assert [event["type"] for event in message["events"]] == ["review_approved"]
+        assert message["events"][0]["review_id"] == review_id
+
+
 class TestStaticAssets:
     """Ensure static routes are exposed."""
 
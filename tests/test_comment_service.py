@@ -439,3 +439,116 @@ class TestCommentService:
         # Verify they're in timestamp order
         for i in range(len(comments) - 1):
             assert comments[i].timestamp <= comments[i + 1].timestamp
+
+    def test_delete_persists_across_instances(self, temp_storage_dir: Path) -> None:
+        """Test that deletions are replayed and queue positions renumbered on load."""
+        storage_path = temp_storage_dir / "comments.jsonl"
+
+        service1 = CommentService(str(storage_path))
+        comment_ids = []
+        for i in range(3):
+            request = CommentRequest(
+                file_path=f"file{i}.txt",
+                line_number=i,
+                side="right",
+                content=f"Comment {i}",
+            )
+            comment, _ = service1.add_comment(request)
+            comment_ids.append(comment.id)
+        service1.delete_comment(comment_ids[0])
+
+        service2 = CommentService(str(storage_path))
+
+        assert service2.get_comment(comment_ids[0]) is None
+        assert service2.get_queue_status() == {comment_ids[1]: 1, comment_ids[2]: 2}
+        comment = service2.get_comment(comment_ids[2])
+        assert comment is not None
+        assert comment.queue_position == 2
+
+    def test_mutations_append_to_log(self, temp_storage_dir: Path) -> None:
+        """Test that each mutation appends a record instead of rewriting the file."""
+        storage_path = temp_storage_dir / "comments.jsonl"
+        service = CommentService(str(storage_path))
+        request = CommentRequest(
+            file_path="test.txt",
+            line_number=1,
+            side="right",
+            content="Original",
+        )
+
+        comment, _ = service.add_comment(request)
+        service.update_comment(comment.id, "Updated")
+
+        records = [json.loads(line) for line in storage_path.read_text().splitlines()]
+        assert [record["op"] for record in records] == ["put", "put"]
+        assert records[1]["comment"]["content"] == "Updated"
+
+    def test_log_is_compacted(self, temp_storage_dir: Path) -> None:
+        """Test that a log dominated by stale records is rewritten as a snapshot."""
+        storage_path = temp_storage_dir / "comments.jsonl"
+        service = CommentService(str(storage_path))
+        request = CommentRequest(
+            file_path="test.txt",
+            line_number=1,
+            side="right",
+            content="Edit 0",
+        )
+        comment, _ = service.add_comment(request)
+
+        for i in range(1, 100):
+            service.update_comment(comment.id, f"Edit {i}")
+
+        assert len(storage_path.read_text().splitlines()) < 100
+        reloaded = CommentService(str(storage_path)).get_comment(comment.id)
+        assert reloaded is not None
+        assert reloaded.content == "Edit 99"
+
+    def test_torn_record_does_not_swallow_later_writes(
+        self, temp_storage_dir: Path
+    ) -> None:
+        """Test that comments added after a torn write survive a reload."""
+        storage_path = temp_storage_dir / "comments.jsonl"
+        request = CommentRequest(
+            file_path="test.txt",
+            line_number=1,
+            side="right",
+            content="Comment",
+        )
+        CommentService(str(storage_path)).add_comment(request)
+        with open(storage_path, "ab") as f:
+            f.write(b'{"op": "put", "comm')
+
+        service = CommentService(str(storage_path))
+        service.add_comment(request)
+        service.add_comment(request)
+
+        assert len(service.get_comments()) == 3
+        assert len(CommentService(str(storage_path)).get_comments()) == 3
+
+    def test_default_store_migrates_legacy_file(
+        self, temp_storage_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that the pre-log JSON store is picked up by the default store."""
+        monkeypatch.setenv("XDG_STATE_HOME", str(temp_storage_dir))
+        state_dir = temp_storage_dir / "backloop"
+        state_dir.mkdir()
+        legacy = {
+            "abc": {
+                "id": "abc",
+                "review_id": "default",
+                "file_path": "test.txt",
+                "line_number": 1,
+                "side": "right",
+                "content": "Old comment",
+                "author": "User",
+                "timestamp": "2024-01-01T00:00:00",
+            }
+        }
+        (state_dir / "backloop_comments.json").write_text(json.dumps(legacy))
+
+        service = CommentService()
+
+        comment = service.get_comment("abc")
+        assert comment is not None
+        assert comment.content == "Old comment"
+        assert (state_dir / "backloop_comments.jsonl").exists()
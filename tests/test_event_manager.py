@@ -1,10 +1,11 @@
 """Unit tests for EventManager."""
 
 import asyncio
+import json
 import time
 import pytest
 
-from backloop.event_manager import EventManager, EventType, Event
+from backloop.event_manager import EventManager, EventType, Event, encode_event_batch
 
 
 class TestEventManager:
@@ -135,6 +136,21 @@ class TestEventManager:
         assert len(events) == 0
         assert 0.4 < elapsed < 0.7  # Allow some tolerance
 
+    async def test_wait_for_events_without_timeout(self) -> None:
+        """Test wait_for_events with no timeout wakes as soon as an event is emitted."""
+        manager = EventManager()
+
+        subscriber = await manager.subscribe()
+        task = asyncio.create_task(manager.wait_for_events(subscriber, timeout=None))
+        await asyncio.sleep(0.05)
+        assert not task.done()
+
+        await manager.emit_event(EventType.FILE_CHANGED, {"path": "a.txt"})
+        events = await asyncio.wait_for(task, timeout=1.0)
+
+        assert [event.data for event in events] == [{"path": "a.txt"}]
+        assert not subscriber.event.is_set()
+
     async def test_wait_for_events_updates_last_event_id(self) -> None:
         """Test that wait_for_events updates last_event_id."""
         manager = EventManager()
@@ -283,6 +299,18 @@ class TestEventManager:
         assert event_dict["review_id"] == "review-1"
         assert event_dict["timestamp"] == event.timestamp
 
+    async def test_encode_event_batch(self) -> None:
+        """Test events are encoded once and batched into one document."""
+        manager = EventManager()
+
+        first = await manager.emit_event(EventType.FILE_CHANGED, {"file_path": "a.txt"})
+        second = await manager.emit_event(EventType.FILE_REMOVED, {"file_path": "b.txt"})
+
+        assert first.to_json() is first.to_json()
+        assert json.loads(encode_event_batch([first, second])) == {
+            "events": [first.to_dict(), second.to_dict()]
+        }
+
     async def test_multiple_event_types(self) -> None:
         """Test handling multiple event types."""
         manager = EventManager()
@@ -0,0 +1,32 @@
+"""Tests for starting and stopping the file watcher."""
+
+import asyncio
+from pathlib import Path
+
+from backloop.event_manager import EventManager
+from backloop.file_watcher import FileWatcher
+
+
+class TestFileWatcher:
+    """Tests for the FileWatcher lifecycle."""
+
+    async def test_restart_cancels_previous_run(self, tmp_path: Path) -> None:
+        watcher = FileWatcher(EventManager(), asyncio.get_running_loop())
+
+        watcher.start_watching(str(tmp_path))
+        first_task = watcher._watch_task
+        first_stop = watcher._stop_event
+        watcher.stop()
+        watcher.start_watching(str(tmp_path))
+        assert first_task is not None
+        await asyncio.wait([first_task], timeout=1)
+
+        assert first_task.cancelled()
+        assert first_stop is not None and first_stop.is_set()
+        assert watcher._stop_event is not first_stop
+        assert watcher._watch_task is not None and not watcher._watch_task.done()
+
+        second_task = watcher._watch_task
+        watcher.stop()
+        await asyncio.wait([second_task], timeout=1)
+        assert second_task.cancelled()
@@ -1,10 +1,11 @@
 """Unit tests for GitService."""
 
 import subprocess
+import sys
 from pathlib import Path
 import pytest
 
-from backloop.git_service import GitService
+from backloop.git_service import GitService, is_immutable_ref
 from backloop.models import LineType, GitDiff
 
 
@@ -110,6 +111,91 @@ class TestGitService:
         assert len(diff.files) == 1
         assert diff.files[0].path == "file2.txt"
 
+    def test_get_commit_diff_caches_hashes(self, git_repo_with_commits: Path) -> None:
+        """Test that diffs are cached by the commit hash a ref resolves to."""
+        service = GitService(str(git_repo_with_commits))
+        commit_hash = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=git_repo_with_commits,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+
+        assert service.get_commit_diff(commit_hash) is service.get_commit_diff(commit_hash)
+        assert service.get_commit_diff("HEAD") is service.get_commit_diff(commit_hash)
+
+        (git_repo_with_commits / "file3.txt").write_text("New file\n")
+        subprocess.run(["git", "add", "."], cwd=git_repo_with_commits, check=True)
+        subprocess.run(
+            ["git", "commit", "-m", "Third commit"], cwd=git_repo_with_commits, check=True
+        )
+
+        diff = service.get_commit_diff("HEAD")
+        assert diff.message == "Third commit"
+        assert [f.path for f in diff.files] == ["file3.txt"]
+
+    def test_get_commit_diff_with_non_utf8_content(self, git_repo_with_commits: Path) -> None:
+        """Test that undecodable bytes are replaced rather than failing the diff."""
+        (git_repo_with_commits / "latin1.txt").write_bytes(b"caf\xe9\r\nok\n")
+        subprocess.run(["git", "add", "."], cwd=git_repo_with_commits, check=True)
+        subprocess.run(
+            ["git", "commit", "-m", "Latin-1 file"], cwd=git_repo_with_commits, check=True
+        )
+        service = GitService(str(git_repo_with_commits))
+
+        diff = service.get_commit_diff("HEAD")
+
+        lines = diff.files[0].chunks[0].lines
+        assert [line.content for line in lines] == ["caf\ufffd", "ok"]
+
+    def test_get_range_diff_with_symbolic_refs(self, git_repo_with_commits: Path) -> None:
+        """Test that ranges of symbolic refs are cached but keep their description."""
+        service = GitService(str(git_repo_with_commits))
+
+        diff = service.get_range_diff("HEAD~1..HEAD")
+
+        assert diff.message == "Range: HEAD~1..HEAD"
+        assert diff.files is service.get_range_diff("HEAD~1..HEAD").files
+
+    def test_get_range_diff_with_single_ref_is_not_cached(
+        self, git_repo_with_commits: Path
+    ) -> None:
+        """Test that a one-ref range, which diffs against the working tree, stays live."""
+        service = GitService(str(git_repo_with_commits))
+        assert service.get_range_diff("HEAD").files == []
+
+        (git_repo_with_commits / "file1.txt").write_text("Changed\n")
+
+        assert [f.path for f in service.get_range_diff("HEAD").files] == ["file1.txt"]
+
+    def test_is_immutable_ref(self) -> None:
+        """Test detection of refs that cannot move."""
+        full_hash = "a" * 40
+        assert is_immutable_ref(full_hash)
+        assert is_immutable_ref(f"{full_hash}..{'b' * 40}")
+        assert is_immutable_ref("c" * 64)
+        assert not is_immutable_ref("HEAD")
+        assert not is_immutable_ref("abc1234")
+        assert not is_immutable_ref(f"main..{full_hash}")
+
+    def test_get_commit_diff_follows_hex_branch_names(
+        self, git_repo_with_commits: Path
+    ) -> None:
+        """Test that a branch named like an abbreviated hash is not cached as one."""
+        service = GitService(str(git_repo_with_commits))
+        subprocess.run(
+            ["git", "branch", "abc1234", "HEAD~1"], cwd=git_repo_with_commits, check=True
+        )
+        first = service.get_commit_diff("abc1234")
+
+        subprocess.run(
+            ["git", "branch", "-f", "abc1234", "HEAD"], cwd=git_repo_with_commits, check=True
+        )
+        second = service.get_commit_diff("abc1234")
+
+        assert first.commit_hash != second.commit_hash
+
     def test_get_range_diff(self, git_repo_with_commits: Path) -> None:
         """Test getting diff for a commit range."""
         service = GitService(str(git_repo_with_commits))
@@ -257,6 +343,15 @@ class TestGitService:
         # Should return empty string for non-existent files
         assert result == ""
 
+    def test_iter_git_lines_with_large_stderr(self, temp_git_repo: Path) -> None:
+        """Test that output is read fully when a command floods stderr."""
+        service = GitService(str(temp_git_repo))
+        script = "import sys; sys.stderr.write('warning\\n' * 50000); print('line 1'); print('line 2')"
+
+        lines = list(service._iter_git_lines([sys.executable, "-c", script]))
+
+        assert lines == ["line 1", "line 2"]
+
     def test_parse_empty_diff(self, temp_git_repo: Path) -> None:
         """Test parsing empty diff output."""
         service = GitService(str(temp_git_repo))
@@ -0,0 +1,83 @@
+"""Tests for starting the embedded web server from the MCP tools."""
+
+import asyncio
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import Any, AsyncGenerator
+
+import pytest
+import uvicorn
+
+from backloop.event_manager import EventManager
+from backloop.mcp import server
+from backloop.services.mcp_service import McpService
+from backloop.services.review_service import ReviewService
+
+
+@pytest.fixture
+async def mcp_server(monkeypatch: pytest.MonkeyPatch) -> AsyncGenerator[ModuleType, None]:
+    """The MCP server module with fresh services and no web server yet."""
+    event_manager = EventManager()
+    review_service = ReviewService(event_manager)
+    monkeypatch.setattr(server, "event_manager", event_manager)
+    monkeypatch.setattr(server, "review_service", review_service)
+    monkeypatch.setattr(server, "mcp_service", McpService(review_service, event_manager))
+    monkeypatch.setattr(server, "web_server_port", None)
+    monkeypatch.setattr(server, "web_server", None)
+    monkeypatch.setattr(server, "web_server_task", None)
+
+    yield server
+
+    if server.web_server is not None and server.web_server_task is not None:
+        server.web_server.should_exit = True
+        await server.web_server_task
+
+
+class TestStartWebServer:
+    """Tests for start_web_server and the review URL it backs."""
+
+    async def test_startreview_starts_and_reuses_server(
+        self, mcp_server: ModuleType, git_repo_with_commits: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.chdir(git_repo_with_commits)
+
+        message = await mcp_server.startreview(since="HEAD")
+
+        port = mcp_server.web_server_port
+        assert port is not None
+        assert f"http://127.0.0.1:{port}/review/" in message
+        _, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.close()
+        await writer.wait_closed()
+        assert await mcp_server.start_web_server() == port
+
+    async def test_failed_startup_raises(
+        self, mcp_server: ModuleType, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        async def failing_startup(self: uvicorn.Server, sockets: Any = None) -> None:
+            # What uvicorn does when the app's lifespan startup fails
+            sys.exit(3)
+
+        monkeypatch.setattr(uvicorn.Server, "startup", failing_startup)
+
+        with pytest.raises(RuntimeError):
+            await mcp_server.start_web_server()
+
+        assert mcp_server.web_server_port is None
+        assert mcp_server.web_server is None
+
+    async def test_startup_timeout_raises(
+        self, mcp_server: ModuleType, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        async def hanging_startup(self: uvicorn.Server, sockets: Any = None) -> None:
+            await asyncio.Event().wait()
+
+        monkeypatch.setattr(uvicorn.Server, "startup", hanging_startup)
+        monkeypatch.setattr(mcp_server, "WEB_SERVER_STARTUP_TIMEOUT", 0.05)
+
+        with pytest.raises(RuntimeError):
+            await mcp_server.start_web_server()
+
+        assert mcp_server.web_server_port is None
+        assert mcp_server.web_server_task is None
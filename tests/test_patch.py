@@ -0,0 +1,117 @@
+"""Tests for the in-process unified diff applier."""
+
+from pathlib import Path
+
+import pytest
+
+from backloop.utils.patch import PatchError, apply_hunks, apply_unified_diff, parse_hunks
+
+
+class TestParseHunks:
+    """Tests for parsing unified diff hunks."""
+
+    def test_parse_single_hunk(self) -> None:
+        patch = """--- a/file.txt
++++ b/file.txt
+@@ -1,2 +1,2 @@
+-old
++new
+ keep
+"""
+        hunks = parse_hunks(patch)
+
+        assert len(hunks) == 1
+        assert hunks[0].old_start == 1
+        assert hunks[0].old_lines == [b"old\n", b"keep\n"]
+        assert hunks[0].new_lines == [b"new\n", b"keep\n"]
+
+    def test_parse_content_resembling_headers(self) -> None:
+        patch = """--- a/file.txt
++++ b/file.txt
+@@ -1 +1 @@
+---- removed
+++++ added
+"""
+        hunks = parse_hunks(patch)
+
+        assert hunks[0].old_lines == [b"--- removed\n"]
+        assert hunks[0].new_lines == [b"+++ added\n"]
+
+    def test_parse_no_newline_marker(self) -> None:
+        patch = """@@ -1 +1 @@
+-old
+\\ No newline at end of file
++new
+\\ No newline at end of file
+"""
+        hunks = parse_hunks(patch)
+
+        assert hunks[0].old_lines == [b"old"]
+        assert hunks[0].new_lines == [b"new"]
+
+    def test_parse_without_hunks(self) -> None:
+        with pytest.raises(PatchError):
+            parse_hunks("--- a/file.txt\n+++ b/file.txt\n")
+
+    def test_parse_truncated_hunk(self) -> None:
+        with pytest.raises(PatchError):
+            parse_hunks("@@ -1,3 +1,3 @@\n line\n")
+
+
+class TestApplyHunks:
+    """Tests for applying parsed hunks to file content."""
+
+    def test_apply_with_offset(self) -> None:
+        patch = """@@ -1,2 +1,2 @@
+ b
+-c
++C
+"""
+        result = apply_hunks(b"a\nb\nc\nd\n", parse_hunks(patch))
+
+        assert result == b"a\nb\nC\nd\n"
+
+    def test_apply_multiple_hunks(self) -> None:
+        patch = """@@ -1 +1 @@
+-a
++A
+@@ -4 +4,2 @@
+ d
++e
+"""
+        result = apply_hunks(b"a\nb\nc\nd\n", parse_hunks(patch))
+
+        assert result == b"A\nb\nc\nd\ne\n"
+
+    def test_apply_to_empty_file(self) -> None:
+        result = apply_hunks(b"", parse_hunks("@@ -0,0 +1 @@\n+first\n"))
+
+        assert result == b"first\n"
+
+    def test_apply_mismatch(self) -> None:
+        with pytest.raises(PatchError):
+            apply_hunks(b"a\nb\n", parse_hunks("@@ -1 +1 @@\n-x\n+y\n"))
+
+
+class TestApplyUnifiedDiff:
+    """Tests for patching files on disk."""
+
+    def test_apply_preserves_mode(self, tmp_path: Path) -> None:
+        target = tmp_path / "script.sh"
+        target.write_text("echo one\n")
+        target.chmod(0o755)
+
+        apply_unified_diff(target, "@@ -1 +1 @@\n-echo one\n+echo two\n")
+
+        assert target.read_text() == "echo two\n"
+        assert target.stat().st_mode & 0o777 == 0o755
+
+    def test_failed_patch_leaves_file_untouched(self, tmp_path: Path) -> None:
+        target = tmp_path / "file.txt"
+        target.write_text("a\nb\n")
+
+        with pytest.raises(PatchError):
+            apply_unified_diff(target, "@@ -1 +1 @@\n-a\n+A\n@@ -2 +2 @@\n-x\n+y\n")
+
+        assert target.read_text() == "a\nb\n"
+        assert list(tmp_path.iterdir()) == [target]
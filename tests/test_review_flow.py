@@ -32,6 +32,13 @@ def test_redirect_to_latest_review(client: TestClient):
     review_id = get_latest_review_id()
     assert f"/review/{review_id}" in response.headers["location"]
 
+def test_redirect_to_review_view(client: TestClient):
+    """Test GET /review/{review_id} redirects to the view with its parameters."""
+    review_id = get_latest_review_id()
+    response = client.get(f"/review/{review_id}", follow_redirects=False)
+    assert response.status_code == 307
+    assert response.headers["location"].startswith(f"/review/{review_id}/view?")
+
 def test_get_review_view(client: TestClient):
     """Test GET /review/{review_id}/view serves the HTML file."""
     review_id = get_latest_review_id()
@@ -40,6 +47,15 @@ def test_get_review_view(client: TestClient):
     assert "text/html" in response.headers["content-type"]
     assert "<title>Backloop Code Review</title>" in response.text
 
+def test_get_review_view_not_modified(client: TestClient):
+    """Test the review page revalidates with its ETag."""
+    review_id = get_latest_review_id()
+    response = client.get(f"/review/{review_id}/view")
+    etag = response.headers["etag"]
+    response = client.get(f"/review/{review_id}/view", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
 def test_get_review_diff(client: TestClient):
     """Test GET /review/{review_id}/api/diff returns diff data."""
     review_id = get_latest_review_id()
@@ -49,6 +65,36 @@ def test_get_review_diff(client: TestClient):
     assert "files" in data
     assert isinstance(data["files"], list)
 
+def test_get_review_diff_not_modified(client: TestClient):
+    """Test the session diff revalidates with its ETag."""
+    review_id = get_latest_review_id()
+    response = client.get(f"/review/{review_id}/api/diff")
+    etag = response.headers["etag"]
+    response = client.get(f"/review/{review_id}/api/diff", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+def test_get_review_comments_not_modified(client: TestClient):
+    """Test the comment list revalidates with its ETag until a comment changes."""
+    review_id = get_latest_review_id()
+    response = client.get(f"/review/{review_id}/api/comments")
+    etag = response.headers["etag"]
+    response = client.get(f"/review/{review_id}/api/comments", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    comment_data = {"file_path": "etag.txt", "line_number": 1, "side": "right", "content": "New"}
+    client.post(f"/review/{review_id}/api/comments", json=comment_data)
+    response = client.get(f"/review/{review_id}/api/comments", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert any(c["file_path"] == "etag.txt" for c in response.json())
+
+def test_get_review_mock_diff(client: TestClient):
+    """Test GET /review/{review_id}/api/diff?mock=true returns the mock diff."""
+    review_id = get_latest_review_id()
+    response = client.get(f"/review/{review_id}/api/diff?mock=true&commit=HEAD&range=HEAD~1..HEAD")
+    assert response.status_code == 200
+    data = response.json()
+    assert [f["path"] for f in data["files"]] == [".github/workflows/ci.yml"]
+
 def test_comment_flow(client: TestClient):
     """Test creating and listing a comment."""
     review_id = get_latest_review_id()
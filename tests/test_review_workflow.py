@@ -24,6 +24,16 @@ class TestReviewWorkflow:
         assert review.diff is not None
         assert len(review.diff.files) > 0
 
+    async def test_refresh_diff_in_thread(self, git_repo_with_commits: Path, review_manager: ReviewManager) -> None:
+        """Test that a live review's diff can be refreshed off the event loop."""
+        review = review_manager.create_review_session(since="HEAD")
+        review.git_service.repo_path = git_repo_with_commits
+        (git_repo_with_commits / "file1.txt").write_text("Changed\n")
+
+        await review.refresh_diff_in_thread()
+
+        assert [f.path for f in review.diff.files] == ["file1.txt"]
+
     async def test_review_session_retrieval(
         self, git_repo_with_commits: Path, review_manager: ReviewManager
     ) -> None:
@@ -55,6 +65,15 @@ class TestReviewWorkflow:
         assert recent is not None
         assert recent.id == review2.id
 
+        # Removing the most recent review falls back to the previous one
+        manager.remove_review_session(review2.id)
+        recent = manager.get_most_recent_review()
+        assert recent is not None
+        assert recent.id == review1.id
+
+        manager.remove_review_session(review1.id)
+        assert manager.get_most_recent_review() is None
+
     async def test_add_comment_to_review(self, git_repo_with_commits: Path, review_manager: ReviewManager) -> None:
         """Test adding comments to a review session."""
         manager = review_manager
@@ -282,6 +301,23 @@ class TestReviewWorkflow:
         assert isinstance(result, ReviewApproved)
         assert result.review_id == review.id
 
+    async def test_await_comments_wakes_on_approval(
+        self, git_repo_with_commits: Path, review_manager: ReviewManager
+    ) -> None:
+        """A waiting await_comments returns as soon as the review is approved."""
+        manager = review_manager
+
+        review = manager.create_review_session(commit="HEAD")
+        waiter = asyncio.create_task(manager.await_comments())
+        await asyncio.sleep(0.05)
+        assert not waiter.done()
+
+        manager.approve_review(review.id)
+        result = await asyncio.wait_for(waiter, timeout=0.5)
+
+        assert isinstance(result, ReviewApproved)
+        assert result.review_id == review.id
+
     async def test_live_diff_workflow(self, git_repo_with_commits: Path, monkeypatch: pytest.MonkeyPatch, review_manager: ReviewManager) -> None:
         """Test creating a review session for live changes."""
         # Change to the git repo directory so GitService picks it up
@@ -341,6 +377,24 @@ class TestReviewWorkflow:
         success = manager.remove_review_session("nonexistent-id")
         assert success is False
 
+    async def test_find_comment_session(self, git_repo_with_commits: Path, review_manager: ReviewManager) -> None:
+        """Test locating the review session that owns a comment."""
+        manager = review_manager
+        review1 = manager.create_review_session(commit="HEAD")
+        review2 = manager.create_review_session(commit="HEAD")
+
+        request = CommentRequest(file_path="file1.txt", line_number=1, side="right", content="Check")
+        comment1, _ = review1.comment_service.add_comment(request)
+        comment2, _ = review2.comment_service.add_comment(request)
+        manager.review_service.register_comment(comment2.id, review2)
+
+        assert manager.review_service.find_comment_session(comment1.id) is review1
+        assert manager.review_service.find_comment_session(comment2.id) is review2
+        assert manager.review_service.find_comment_session("missing") is None
+
+        manager.remove_review_session(review2.id)
+        assert manager.review_service.find_comment_session(comment2.id) is None
+
     async def test_get_most_recent_review_empty(self, review_manager: ReviewManager) -> None:
         """Test getting most recent review when no reviews exist."""
         manager = review_manager